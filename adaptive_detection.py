@@ -0,0 +1,147 @@
+import time
+import cv2
+import numpy as np
+
+DIFF_SIZE = (64, 48)
+FLOW_WIDTH = 320
+
+
+class TrackState:
+    def __init__(self):
+        self.keyframe = None
+        self.prev_gray = None
+        self.scale = 1.0
+        self.detections = []
+        self.points = []
+        self.since_detect = 0
+
+
+class AdaptiveDetector:
+    # Wraps an ObjectDetector/BatchObjectDetector and only runs the SSD
+    # forward pass every `interval` frames, or sooner when the frame has
+    # changed a lot since the last keyframe. In between, boxes are moved with
+    # sparse Lucas-Kanade optical flow. With a target_fps the interval adapts
+    # to the measured detection and tracking costs.
+    def __init__(self, detector, interval=5, diff_threshold=12.0, target_fps=None,
+                 min_interval=1, max_interval=30):
+        self.detector = detector
+        self.interval = interval
+        self.diff_threshold = diff_threshold
+        self.target_fps = target_fps
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.states = {}
+        self.detect_time = None
+        self.track_time = None
+        self.detections_run = 0
+        self.frames_seen = 0
+
+    def class_name(self, class_id):
+        return self.detector.class_name(class_id)
+
+    def _state(self, source):
+        if source not in self.states:
+            self.states[source] = TrackState()
+        return self.states[source]
+
+    def _prepare(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        scale = min(1.0, FLOW_WIDTH / gray.shape[1])
+        if scale < 1.0:
+            gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        return gray, scale
+
+    def _needs_detection(self, state, gray):
+        if state.keyframe is None or state.since_detect >= self.interval:
+            return True
+        small = cv2.resize(gray, DIFF_SIZE, interpolation=cv2.INTER_AREA)
+        return float(cv2.absdiff(small, state.keyframe).mean()) > self.diff_threshold
+
+    def _start_tracks(self, state, gray, scale, detections):
+        state.keyframe = cv2.resize(gray, DIFF_SIZE, interpolation=cv2.INTER_AREA)
+        state.prev_gray = gray
+        state.scale = scale
+        state.detections = detections
+        state.since_detect = 0
+        state.points = []
+        for _, _, (x, y, w, h) in detections:
+            mask = np.zeros_like(gray)
+            x0, y0 = int(x * scale), int(y * scale)
+            mask[y0:y0 + max(1, int(h * scale)), x0:x0 + max(1, int(w * scale))] = 255
+            state.points.append(cv2.goodFeaturesToTrack(gray, maxCorners=20, qualityLevel=0.01,
+                                                        minDistance=5, mask=mask))
+
+    def _propagate(self, state, gray):
+        moved = []
+        points = []
+        for detection, pts in zip(state.detections, state.points):
+            classId, confidence, (x, y, w, h) = detection
+            if pts is None or len(pts) < 3:
+                moved.append(detection)
+                points.append(pts)
+                continue
+            new_pts, status, _ = cv2.calcOpticalFlowPyrLK(state.prev_gray, gray, pts, None)
+            good = status.reshape(-1) == 1
+            if good.sum() < 3:
+                moved.append(detection)
+                points.append(pts)
+                continue
+            dx, dy = np.median((new_pts[good] - pts[good]).reshape(-1, 2), axis=0) / state.scale
+            moved.append((classId, confidence, (int(x + dx), int(y + dy), w, h)))
+            points.append(new_pts[good].reshape(-1, 1, 2))
+        state.detections = moved
+        state.points = points
+        state.prev_gray = gray
+        state.since_detect += 1
+        return moved
+
+    def _record(self, attr, elapsed):
+        previous = getattr(self, attr)
+        setattr(self, attr, elapsed if previous is None else 0.8 * previous + 0.2 * elapsed)
+
+    def _adapt_interval(self):
+        if not self.target_fps or self.detect_time is None or self.track_time is None:
+            return
+        # Smallest K with (detect + (K - 1) * track) / K within the frame budget
+        budget = 1.0 / self.target_fps
+        if budget <= self.track_time:
+            interval = self.max_interval
+        else:
+            interval = int(np.ceil((self.detect_time - self.track_time) / (budget - self.track_time)))
+        self.interval = max(self.min_interval, min(self.max_interval, interval))
+
+    def detect(self, frame, source=None):
+        return self.detect_batch([frame], [source])[0]
+
+    def detect_batch(self, frames, sources=None):
+        # Frames from the same source must be handled in order, so without
+        # distinct sources every frame is its own batch.
+        if sources is None:
+            return [self.detect(frame) for frame in frames]
+
+        prepared = [self._prepare(frame) for frame in frames]
+        states = [self._state(source) for source in sources]
+        need = [self._needs_detection(state, gray) for state, (gray, _) in zip(states, prepared)]
+
+        results = [None] * len(frames)
+        keyframes = [i for i, n in enumerate(need) if n]
+        if keyframes:
+            start = time.perf_counter()
+            found = self.detector.detect_batch([frames[i] for i in keyframes])
+            self._record('detect_time', (time.perf_counter() - start) / len(keyframes))
+            for i, detections in zip(keyframes, found):
+                gray, scale = prepared[i]
+                self._start_tracks(states[i], gray, scale, detections)
+                results[i] = detections
+            self.detections_run += len(keyframes)
+
+        tracked = [i for i, n in enumerate(need) if not n]
+        if tracked:
+            start = time.perf_counter()
+            for i in tracked:
+                results[i] = self._propagate(states[i], prepared[i][0])
+            self._record('track_time', (time.perf_counter() - start) / len(tracked))
+
+        self.frames_seen += len(frames)
+        self._adapt_interval()
+        return results
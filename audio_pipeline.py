@@ -0,0 +1,319 @@
+import argparse
+import collections
+import queue
+import threading
+import time
+import wave
+
+import numpy as np
+
+from frame_pipeline import DropQueue
+
+CHUNK_MS = 30
+
+
+class WavSource:
+    # Stands in for the microphone: yields a 16-bit WAV file chunk by chunk,
+    # optionally paced at real time. Multi-channel files are reduced to the
+    # first channel.
+    def __init__(self, path, chunk_ms=CHUNK_MS, realtime=False):
+        self.wav = wave.open(path, 'rb')
+        if self.wav.getsampwidth() != 2:
+            self.wav.close()
+            raise RuntimeError(f"{path}: only 16-bit PCM WAV files are supported")
+        self.name = path
+        self.sample_rate = self.wav.getframerate()
+        self.sample_width = 2
+        self.channels = self.wav.getnchannels()
+        self.chunk = max(1, self.sample_rate * chunk_ms // 1000)
+        self.realtime = realtime
+        # Files read faster than real time must not lose chunks in the ring
+        self.live = realtime
+        self.next_time = None
+
+    def read(self):
+        data = self.wav.readframes(self.chunk)
+        if not data:
+            return None
+        if self.channels > 1:
+            data = np.frombuffer(data, dtype=np.int16).reshape(-1, self.channels)[:, 0].tobytes()
+        if self.realtime:
+            now = time.perf_counter()
+            self.next_time = (self.next_time or now) + self.chunk / self.sample_rate
+            if self.next_time > now:
+                time.sleep(self.next_time - now)
+        return data
+
+    def close(self):
+        self.wav.close()
+
+
+class MicrophoneSource:
+    # The microphone is opened once and read continuously; nothing is
+    # recalibrated or reopened between utterances.
+    def __init__(self, sample_rate=16000, chunk_ms=CHUNK_MS, device_index=None):
+        import speech_recognition as sr
+        self.name = "microphone"
+        self.live = True
+        self.mic = sr.Microphone(device_index=device_index, sample_rate=sample_rate,
+                                 chunk_size=max(1, sample_rate * chunk_ms // 1000))
+        self.mic.__enter__()
+        self.sample_rate = self.mic.SAMPLE_RATE
+        self.sample_width = self.mic.SAMPLE_WIDTH
+        self.chunk = self.mic.CHUNK
+
+    def read(self):
+        return self.mic.stream.read(self.chunk)
+
+    def close(self):
+        self.mic.__exit__(None, None, None)
+
+
+class Utterance:
+    def __init__(self, pcm, sample_rate, sample_width, start, end):
+        self.pcm = pcm
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.start = start
+        self.end = end
+        self.cut_time = time.perf_counter()
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+    def to_audio_data(self):
+        import speech_recognition as sr
+        return sr.AudioData(self.pcm, self.sample_rate, self.sample_width)
+
+
+def chunk_energy(chunk):
+    samples = np.frombuffer(chunk, dtype=np.int16).astype(np.float32)
+    return float(np.sqrt(np.mean(samples * samples))) if samples.size else 0.0
+
+
+class EnergyVAD:
+    # Cuts utterances out of a continuous 16-bit stream. The noise floor is
+    # calibrated once from the first `calibration_ms` and then follows the
+    # background level with an exponential moving average while nobody is
+    # speaking. Speech starts after `start_ms` above the threshold and ends
+    # after `hangover_ms` below it; `preroll_ms` of audio before the onset is
+    # kept so first syllables are not clipped. While `echo` is set (our own
+    # reply is playing) the threshold is `echo_ratio` times higher and the
+    # noise floor does not follow the reply.
+    def __init__(self, sample_rate, chunk_ms=CHUNK_MS, calibration_ms=500, ratio=3.0,
+                 min_energy=60.0, adapt=0.05, start_ms=90, hangover_ms=600,
+                 preroll_ms=300, max_phrase_ms=10000, sample_width=2, echo_ratio=4.0):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.chunk_ms = chunk_ms
+        self.calibration_chunks = max(1, calibration_ms // chunk_ms)
+        self.ratio = ratio
+        self.min_energy = min_energy
+        self.adapt = adapt
+        self.echo_ratio = echo_ratio
+        self.echo = False
+        self.start_chunks = max(1, start_ms // chunk_ms)
+        self.hangover_chunks = max(1, hangover_ms // chunk_ms)
+        self.max_phrase_chunks = max(1, max_phrase_ms // chunk_ms)
+        self.preroll = collections.deque(maxlen=max(1, preroll_ms // chunk_ms))
+        self.calibration = []
+        self.noise_floor = None
+        self.position = 0
+        self.reset()
+
+    def reset(self):
+        self.voiced = []
+        self.voiced_start = None
+        self.above = 0
+        self.below = 0
+        self.in_speech = False
+
+    @property
+    def calibrated(self):
+        return self.noise_floor is not None
+
+    @property
+    def threshold(self):
+        threshold = max(self.min_energy, (self.noise_floor or 0.0) * self.ratio)
+        return threshold * self.echo_ratio if self.echo else threshold
+
+    def seconds(self, samples):
+        return samples / self.sample_rate
+
+    def feed(self, chunk):
+        start = self.position
+        self.position += len(chunk) // self.sample_width
+        energy = chunk_energy(chunk)
+
+        if not self.calibrated:
+            self.calibration.append(energy)
+            if len(self.calibration) >= self.calibration_chunks:
+                self.noise_floor = float(np.mean(self.calibration))
+            return None
+
+        loud = energy > self.threshold
+        if not self.in_speech:
+            if not loud:
+                if not self.echo:
+                    self.noise_floor += self.adapt * (energy - self.noise_floor)
+                self.above = 0
+                self.preroll.append((start, chunk))
+                return None
+            self.above += 1
+            self.preroll.append((start, chunk))
+            if self.above < self.start_chunks:
+                return None
+            self.in_speech = True
+            self.voiced_start = self.preroll[0][0]
+            self.voiced = [c for _, c in self.preroll]
+            self.preroll.clear()
+            self.below = 0
+            return None
+
+        self.voiced.append(chunk)
+        self.below = 0 if loud else self.below + 1
+        if self.below >= self.hangover_chunks or len(self.voiced) >= self.max_phrase_chunks:
+            pcm = b''.join(self.voiced)
+            utterance = Utterance(pcm, self.sample_rate, self.sample_width,
+                                  self.seconds(self.voiced_start), self.seconds(self.position))
+            self.reset()
+            return utterance
+        return None
+
+    def flush(self):
+        # End of stream: whatever is being spoken counts as an utterance
+        if not self.in_speech or not self.voiced:
+            return None
+        utterance = Utterance(b''.join(self.voiced), self.sample_rate, self.sample_width,
+                              self.seconds(self.voiced_start), self.seconds(self.position))
+        self.reset()
+        return utterance
+
+
+class AudioPipeline:
+    # Capture -> VAD -> recognition, each on its own thread. Capture writes
+    # into a bounded ring (a DropQueue) so a stalled stage can never block
+    # the audio device; the recognizer works through cut utterances while
+    # the next one is already being captured. While paused, audio keeps
+    # flowing so the noise floor stays current, but no utterances are cut.
+    # `playback` (optional) tells whether our own reply is playing: then only
+    # speech above the VAD's raised echo threshold counts (barge-in) and
+    # anything else heard meanwhile is dropped, so the reply picked up by
+    # the microphone is never recognized and answered.
+    def __init__(self, source, recognize, on_result, on_speech=None, vad=None, ring_ms=3000,
+                 playback=None):
+        self.source = source
+        self.recognize = recognize
+        self.on_result = on_result
+        self.on_speech = on_speech
+        self.playback = playback
+        self.barge_in = False
+        self.vad = vad or EnergyVAD(source.sample_rate, sample_width=source.sample_width)
+        self.ring = DropQueue(maxsize=max(1, ring_ms // self.vad.chunk_ms))
+        self.utterances = queue.Queue()
+        self.listening = True
+        self.running = False
+        self.threads = []
+        self.finished = threading.Event()
+
+    def start(self):
+        self.running = True
+        for target in (self.capture_loop, self.vad_loop, self.recognize_loop):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def capture_loop(self):
+        try:
+            while self.running:
+                chunk = self.source.read()
+                if chunk is None:
+                    break
+                while not self.source.live and self.running and len(self.ring) >= self.ring.maxsize:
+                    time.sleep(0.001)
+                self.ring.put(chunk)
+        except Exception as e:
+            print(f"❌ Audio capture stopped: {e}")
+        finally:
+            self.ring.close()
+
+    def vad_loop(self):
+        while self.running:
+            try:
+                chunk = self.ring.get(timeout=0.5)
+            except queue.Empty:
+                if self.ring.closed:
+                    break
+                continue
+            playing = bool(self.playback and self.playback())
+            self.vad.echo = playing
+            if playing and self.vad.in_speech and not self.barge_in:
+                # Started before the reply did; the rest would be the reply
+                self.vad.reset()
+            was_speaking = self.vad.in_speech
+            utterance = self.vad.feed(chunk)
+            if not self.listening:
+                self.vad.reset()
+                continue
+            if self.vad.in_speech and not was_speaking:
+                self.barge_in = playing
+                if self.on_speech:
+                    self.on_speech()
+            if utterance:
+                self.utterances.put(utterance)
+        utterance = self.vad.flush()
+        if utterance and self.listening:
+            self.utterances.put(utterance)
+        self.utterances.put(None)
+
+    def recognize_loop(self):
+        while True:
+            utterance = self.utterances.get()
+            if utterance is None or not self.running:
+                break
+            try:
+                text, error = self.recognize(utterance), None
+            except Exception as e:
+                text, error = None, e
+            self.on_result(utterance, text, error)
+        self.finished.set()
+
+    def stop(self, timeout=1.0):
+        self.running = False
+        self.utterances.put(None)
+        for thread in self.threads:
+            thread.join(timeout)
+        self.source.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cut WAV files into utterances (optionally recognize them)")
+    parser.add_argument('wavs', nargs='+')
+    parser.add_argument('--recognize', metavar='BACKEND',
+                        help="also run a speech_backends recognizer (google, sphinx, vosk)")
+    parser.add_argument('--realtime', action='store_true', help="pace the files like a live mic")
+    args = parser.parse_args()
+
+    speech = None
+    if args.recognize:
+        from speech_backends import SpeechRecognizer
+        speech = SpeechRecognizer(args.recognize)
+
+    def recognize(utterance):
+        return speech.recognize(utterance.to_audio_data()) if speech else None
+
+    def report(utterance, text, error):
+        line = f"   {utterance.start:7.2f}s - {utterance.end:7.2f}s"
+        if speech:
+            line += f"  {speech.last_latency * 1000:7.1f} ms  " + (text if error is None else f"({error!r})")
+        print(line)
+
+    for path in args.wavs:
+        print(path)
+        pipeline = AudioPipeline(WavSource(path, realtime=args.realtime), recognize, report)
+        pipeline.start()
+        pipeline.finished.wait()
+        pipeline.stop()
+        print(f"   noise floor {pipeline.vad.noise_floor or 0:.0f}, "
+              f"{pipeline.ring.dropped} chunk(s) dropped")
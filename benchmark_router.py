@@ -0,0 +1,86 @@
+import argparse
+import random
+import time
+
+from intent_router import IntentRouter, tokenize
+
+WORDS = ("alpha bravo charlie delta echo foxtrot golf hotel india juliet kilo lima mike "
+         "november oscar papa quebec romeo sierra tango uniform victor whiskey xray "
+         "yankee zulu").split()
+
+
+def make_intents(count, rng):
+    # Two keyword phrases per intent, one or two words each, drawn from a
+    # small shared vocabulary plus a numbered word that keeps them distinct
+    intents = []
+    for i in range(count):
+        phrases = [f"{rng.choice(WORDS)}{i}",
+                   f"{rng.choice(WORDS)} {rng.choice(WORDS)}{i}"]
+        intents.append((f"intent{i}", phrases, rng.randint(0, 100)))
+    return intents
+
+
+def make_utterances(intents, count, rng):
+    utterances = []
+    for _ in range(count):
+        filler = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 10)))
+        if rng.random() < 0.8:
+            phrase = rng.choice(rng.choice(intents)[1])
+            utterances.append(f"{filler} {phrase} please")
+        else:
+            utterances.append(filler)
+    return utterances
+
+
+def linear_route(intents, text):
+    # What the old if/elif chain does: every intent checked in order
+    t = text.lower()
+    for name, phrases, _ in intents:
+        if any(phrase in t for phrase in phrases):
+            return name
+    return None
+
+
+def time_per_call(func, utterances, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in utterances:
+            func(text)
+    return (time.perf_counter() - start) / (repeat * len(utterances))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Intent routing latency vs. number of intents")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 5000])
+    parser.add_argument('--utterances', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("INTENT ROUTER BENCHMARK")
+    print("=" * 60)
+    print(f"{'intents':>8}  {'compile':>10}  {'router':>10}  {'if/elif':>10}")
+    for size in args.sizes:
+        rng = random.Random(args.seed)
+        intents = make_intents(size, rng)
+        utterances = make_utterances(intents, args.utterances, rng)
+
+        router = IntentRouter()
+        start = time.perf_counter()
+        for name, phrases, priority in intents:
+            router.register(name, phrases, lambda text, name=name: name, priority=priority)
+        router.compile()
+        compile_time = time.perf_counter() - start
+
+        routed = time_per_call(router.route, utterances, args.repeat)
+        linear = time_per_call(lambda text: linear_route(intents, text), utterances,
+                               max(1, args.repeat // 5))
+        print(f"{size:>8}  {compile_time * 1000:8.1f}ms  {routed * 1e6:8.2f}us  {linear * 1e6:8.2f}us")
+
+    tokens = sum(len(tokenize(text)) for text in utterances) / len(utterances)
+    print(f"\n(avg {tokens:.1f} words per utterance; router cost tracks words, not intents)")
+
+
+if __name__ == "__main__":
+    main()
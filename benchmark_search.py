@@ -0,0 +1,76 @@
+import argparse
+import gc
+import random
+import time
+
+from benchmark_tasks import VISIBLE_ROWS, make_tasks
+from task_collection import TaskCollection
+from task_search import TaskSearchIndex
+
+SYLLABLES = "ba ce di fo gu ha ke li mo nu pa re si to vu wa xe yo za qu".split()
+QUERIES = [("one word", "{word}", None),
+           ("prefix", "{prefix}", None),
+           ("two words", "{word} {other}", None),
+           ("word + filter", "{word}", {"High", "Critical"}),
+           ("filter only", "", {"Critical"}),
+           ("broad prefix", "{short}", None)]
+
+
+def make_vocabulary(size, rng):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Task search latency over an inverted index")
+    parser.add_argument('--tasks', type=int, default=100000)
+    parser.add_argument('--vocabulary', type=int, default=5000)
+    parser.add_argument('--queries', type=int, default=50, help="runs per query kind")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(args.vocabulary, rng)
+    tasks = make_tasks(args.tasks, rng)
+    for task in tasks:
+        task.title = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(2, 6)))
+        task.description = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(0, 12)))
+
+    print("=" * 60)
+    print(f"TASK SEARCH BENCHMARK ({args.tasks} tasks, {args.vocabulary} words)")
+    print("=" * 60)
+    collection = TaskCollection(tasks)
+    gc.collect()
+    start = time.perf_counter()
+    index = TaskSearchIndex(collection)
+    print(f"build index:      {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+    extra = make_tasks(args.queries, rng, offset=args.tasks)
+    start = time.perf_counter()
+    for task in extra:
+        collection.add(task)
+        index.add(task)
+    for task in extra:
+        index.remove(collection.remove(task.id))
+    print(f"add + remove:     {(time.perf_counter() - start) / args.queries * 1e6:8.1f} us per task")
+
+    for name, pattern, priorities in QUERIES:
+        timings, hits = [], 0
+        for _ in range(args.queries):
+            word, other = rng.choice(vocabulary), rng.choice(vocabulary)
+            query = pattern.format(word=word, other=other, prefix=word[:3], short=word[:2])
+            start = time.perf_counter()
+            # Time to the first screen of results, what the search box waits for
+            results = index.search(query, priorities)
+            first_page = [results[i] for i in range(min(VISIBLE_ROWS, len(results)))]
+            timings.append(time.perf_counter() - start)
+            hits += len(results)
+        timings.sort()
+        print(f"{name + ':':<17} {timings[len(timings) // 2] * 1000:8.2f} ms median, "
+              f"{timings[-1] * 1000:.2f} ms max, {hits / args.queries:.0f} results on average")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+from model_server import BENCHMARK_ENV, LAUNCH_T0_ENV
+
+TOOLS = ['voice_assistant.py', 'object_detection.py', 'emotion_detection.py', 'todo_list.py']
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure_imports(tool, top=5):
+    # `python -X importtime` on the tool module alone: total import cost and
+    # the heaviest modules it imports directly
+    module = os.path.splitext(tool)[0]
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True)
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            entries.append((len(match.group(3)), int(match.group(2)) / 1e6, match.group(4)))
+    total = None
+    packages = []
+    for i, (indent, cumulative, name) in enumerate(entries):
+        if name != module:
+            continue
+        total = cumulative
+        # Direct children are printed just before their parent, one level deeper
+        for child_indent, child_cumulative, child_name in reversed(entries[:i]):
+            if child_indent <= indent:
+                break
+            if child_indent == indent + 2:
+                packages.append((child_cumulative, child_name))
+        break
+    return total, sorted(packages, reverse=True)[:top]
+
+
+def measure_startup(tool, timeout):
+    # Launch the real tool in benchmark mode; it reports its milestones
+    # relative to our launch time and closes itself once models are loaded.
+    env = dict(os.environ)
+    env[BENCHMARK_ENV] = '1'
+    env[LAUNCH_T0_ENV] = repr(time.time())
+    try:
+        result = subprocess.run([sys.executable, tool], env=env, capture_output=True,
+                                text=True, timeout=timeout)
+    except subprocess.TimeoutExpired as e:
+        output = e.stdout or ''
+        if isinstance(output, bytes):
+            output = output.decode(errors='replace')
+    else:
+        output = result.stdout
+    milestones = {}
+    for line in output.splitlines():
+        parts = line.split()
+        if len(parts) == 4 and parts[0] == 'BENCHMARK':
+            milestones[parts[2]] = float(parts[3])
+    return milestones
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time-to-import, time-to-first-window and time-to-first-inference per tool")
+    parser.add_argument('tools', nargs='*', default=TOOLS)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--timeout', type=float, default=120.0)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("STARTUP BENCHMARK")
+    print("=" * 60)
+    for tool in args.tools:
+        print(f"\n{tool}")
+        total, packages = measure_imports(tool)
+        if total is None:
+            print("   ❌ import failed")
+        else:
+            heaviest = ", ".join(f"{name} {seconds * 1000:.0f}ms" for seconds, name in packages)
+            print(f"   import:          {total * 1000:8.1f} ms  ({heaviest})")
+
+        samples = {}
+        for _ in range(args.runs):
+            for milestone, seconds in measure_startup(tool, args.timeout).items():
+                samples.setdefault(milestone, []).append(seconds)
+        if not samples:
+            print("   ❌ no milestones reported (no display?)")
+        for milestone in ('first_window', 'first_inference'):
+            if milestone in samples:
+                values = samples[milestone]
+                print(f"   {milestone + ':':<16} {statistics.median(values) * 1000:8.1f} ms  "
+                      f"(median of {len(values)})")
+
+
+if __name__ == "__main__":
+    main()
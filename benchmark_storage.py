@@ -0,0 +1,99 @@
+import argparse
+import datetime
+import os
+import random
+import shutil
+import tempfile
+import time
+import uuid
+
+from task_model import Task
+from task_store import JournalTaskStore, JsonTaskStore, SqliteTaskStore
+from task_writer import TaskWriter
+
+PRIORITIES = ["Low", "Medium", "High", "Critical"]
+STORES = {'json': JsonTaskStore, 'journal': JournalTaskStore, 'sqlite': SqliteTaskStore}
+
+
+def make_task(rng, i):
+    created = datetime.datetime(2025, 1, 1) + datetime.timedelta(seconds=i * 37)
+    return Task.from_dict({'id': str(uuid.UUID(int=rng.getrandbits(128))),
+                           'title': f"Task {i}",
+                           'description': "Follow up on item %d before the review" % i if i % 3 else "",
+                           'priority': rng.choice(PRIORITIES),
+                           'created_at': created.isoformat()})
+
+
+def populate(kind, directory, tasks):
+    if kind in ('json', 'journal'):
+        store = JsonTaskStore(os.path.join(directory, "tasks.json"))
+        store.write({task.id: task for task in tasks})
+    else:
+        store = SqliteTaskStore(os.path.join(directory, "tasks.db"))
+        store.add_many(tasks)
+        store.close()
+    return store.path
+
+
+def measure(kind, size, ops, rng):
+    directory = tempfile.mkdtemp(prefix="neurotask-bench-")
+    try:
+        path = populate(kind, directory, [make_task(rng, i) for i in range(size)])
+        store = STORES[kind](path)
+
+        start = time.perf_counter()
+        loaded = store.load()
+        load_time = time.perf_counter() - start
+
+        added = [make_task(rng, size + i) for i in range(ops)]
+        start = time.perf_counter()
+        for task in added:
+            store.add(task)
+        add_time = (time.perf_counter() - start) / ops
+
+        start = time.perf_counter()
+        for task in added:
+            store.delete(task.id)
+        delete_time = (time.perf_counter() - start) / ops
+        store.close()
+
+        # The same changes as a burst through the background writer: what
+        # the Tk thread pays per change, and how many batches reach the disk
+        store = STORES[kind](path)
+        store.load()
+        writer = TaskWriter(store, delay=0.05)
+        start = time.perf_counter()
+        for task in added:
+            writer.add(task)
+        for task in added:
+            writer.delete(task.id)
+        caller_time = (time.perf_counter() - start) / (2 * ops)
+        writer.close()
+        return len(loaded), load_time, add_time, delete_time, caller_time, writer.batches
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="tasks.json vs journal vs SQLite task storage")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--ops', type=int, default=20, help="adds and deletes timed per size")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("TASK STORAGE BENCHMARK")
+    print("=" * 60)
+    print(f"{'tasks':>8}  {'store':>7}  {'load':>10}  {'add':>10}  {'delete':>10}  "
+          f"{'writer':>10}  {'batches':>7}")
+    for size in args.sizes:
+        for kind in STORES:
+            count, load_time, add_time, delete_time, caller_time, batches = measure(
+                kind, size, args.ops, random.Random(args.seed))
+            print(f"{count:>8}  {kind:>7}  {load_time * 1000:8.1f}ms  "
+                  f"{add_time * 1000:8.2f}ms  {delete_time * 1000:8.2f}ms  "
+                  f"{caller_time * 1e6:8.1f}us  {batches:>7}")
+
+
+if __name__ == "__main__":
+    main()
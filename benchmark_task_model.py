@@ -0,0 +1,129 @@
+import argparse
+import datetime
+import gc
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+import task_model
+from task_model import Task
+from task_store import JsonTaskStore, write_atomic
+
+PRIORITIES = ["Low", "Medium", "High", "Critical"]
+
+
+class LegacyTask:
+    # Task as it was before task_model: a __dict__ per instance, string UUID
+    # and ISO timestamp
+    def __init__(self, title, description="", priority="Medium"):
+        self.id = str(uuid.uuid4())
+        self.title = title
+        self.description = description
+        self.priority = priority
+        self.created_at = datetime.datetime.now().isoformat()
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'priority': self.priority,
+            'created_at': self.created_at
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        task = cls(data['title'], data['description'], data['priority'])
+        task.id = data['id']
+        task.created_at = data['created_at']
+        return task
+
+
+def make_tasks(cls, count, seed):
+    rng = random.Random(seed)
+    # Priorities come from the Combobox as fresh strings, not shared constants
+    return [cls(f"Task {i}", f"Follow up on item {i}" if i % 3 else "",
+                "".join(rng.choice(PRIORITIES)))
+            for i in range(count)]
+
+
+def measure_memory(cls, count, seed, store_entry):
+    # The tasks plus what the json store keeps next to them: the old store
+    # held a to_dict() per task, the new one the same Task objects
+    gc.collect()
+    tracemalloc.start()
+    tasks = make_tasks(cls, count, seed)
+    store = {task.id: store_entry(task) for task in tasks}
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del store
+    return tasks, used
+
+
+def timed(func):
+    gc.collect()
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def legacy_save(tasks, path):
+    # The old serializer, made atomic like JsonTaskStore.save so only the
+    # serialization differs
+    write_atomic(path, json.dumps({task.id: task.to_dict() for task in tasks}, indent=2).encode())
+
+
+def legacy_load(path):
+    with open(path, 'r') as f:
+        return [LegacyTask.from_dict(data) for data in json.load(f).values()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact Task memory and tasks.json save/load time")
+    parser.add_argument('--tasks', type=int, default=1000000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"TASK MODEL BENCHMARK ({args.tasks} tasks, json store)")
+    print("=" * 60)
+    directory = tempfile.mkdtemp(prefix="neurotask-bench-")
+    legacy_path = os.path.join(directory, "legacy.json")
+    compact_path = os.path.join(directory, "compact.json")
+    try:
+        legacy, legacy_bytes = measure_memory(LegacyTask, args.tasks, args.seed,
+                                              lambda task: task.to_dict())
+        compact, compact_bytes = measure_memory(Task, args.tasks, args.seed, lambda task: task)
+        print(f"{'':>10}  {'memory':>12}  {'save':>9}  {'load':>9}  {'file':>9}")
+
+        _, legacy_save_time = timed(lambda: legacy_save(legacy, legacy_path))
+        loaded, legacy_load_time = timed(lambda: legacy_load(legacy_path))
+        print(f"{'legacy':>10}  {legacy_bytes / args.tasks:8.0f} B/t  {legacy_save_time:8.2f}s  "
+              f"{legacy_load_time:8.2f}s  {os.path.getsize(legacy_path) / 1e6:6.0f} MB")
+        del legacy, loaded
+
+        # Through JsonTaskStore, i.e. the path the to-do list takes
+        store = JsonTaskStore(compact_path)
+        _, compact_save_time = timed(lambda: store.write({task.id: task for task in compact}))
+        loaded, compact_load_time = timed(lambda: JsonTaskStore(compact_path).load())
+        print(f"{'compact':>10}  {compact_bytes / args.tasks:8.0f} B/t  {compact_save_time:8.2f}s  "
+              f"{compact_load_time:8.2f}s  {os.path.getsize(compact_path) / 1e6:6.0f} MB")
+        print(f"orjson for parsing: {'yes' if task_model.orjson is not None else 'no'}")
+
+        # Both sides must read each other's files (same tasks.json schema)
+        legacy_view = {task.id: task.to_dict() for task in legacy_load(compact_path)}
+        compact_view = {task['id']: task for task in (t.to_dict() for t in loaded)}
+        print(f"schema compatible: {'yes' if legacy_view == compact_view else 'NO'}")
+    finally:
+        for path in (legacy_path, compact_path):
+            if os.path.exists(path):
+                os.remove(path)
+        os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import argparse
+import datetime
+import random
+import time
+
+from task_collection import PRIORITIES, PRIORITY_RANK, TaskCollection
+from task_model import Task, to_timestamp
+
+VISIBLE_ROWS = 8
+
+
+def make_tasks(count, rng, offset=0):
+    start = to_timestamp(datetime.datetime(2025, 1, 1))
+    tasks = []
+    for i in range(offset, offset + count):
+        task = Task(f"Task {i}", "", rng.choice(PRIORITIES))
+        task.created_at = start + i * 1000000
+        tasks.append(task)
+    return tasks
+
+
+def sorted_refresh(tasks):
+    # What refresh_tasks used to do after every change
+    return sorted(tasks.values(), key=lambda t: PRIORITY_RANK[t.priority])
+
+
+def per_op(func, items):
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    return (time.perf_counter() - start) / max(1, len(items))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TaskCollection vs dict + sort per refresh")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--ops', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("TASK COLLECTION BENCHMARK (per operation, including the list refresh)")
+    print("=" * 60)
+    print(f"{'tasks':>8}  {'':>10}  {'add':>10}  {'complete':>10}  {'list':>10}")
+    for size in args.sizes:
+        rng = random.Random(args.seed)
+        base = make_tasks(size, rng)
+        extra = make_tasks(args.ops, rng, offset=size)
+        # Old path: only a fraction of the ops, a full sort is too slow at 100k
+        slow_ops = max(1, args.ops // 20)
+
+        collection = TaskCollection(base)
+        show = lambda: [collection[i] for i in range(min(VISIBLE_ROWS, len(collection)))]
+        add = per_op(lambda task: (collection.add(task), show()), extra)
+        complete = per_op(lambda task: (collection.remove(task.id), show()), extra)
+        listing = per_op(lambda _: show(), range(args.ops))
+        print(f"{size:>8}  {'collection':>10}  {add * 1e6:8.1f}us  {complete * 1e6:8.1f}us  "
+              f"{listing * 1e6:8.1f}us")
+
+        tasks = {task.id: task for task in base}
+        add = per_op(lambda task: (tasks.__setitem__(task.id, task), sorted_refresh(tasks)),
+                     extra[:slow_ops])
+        complete = per_op(lambda task: (tasks.pop(task.id), sorted_refresh(tasks)), extra[:slow_ops])
+        listing = per_op(lambda _: sorted_refresh(tasks), range(slow_ops))
+        print(f"{size:>8}  {'dict+sort':>10}  {add * 1e6:8.1f}us  {complete * 1e6:8.1f}us  "
+              f"{listing * 1e6:8.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+import argparse
+import os
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from multiprocessing.connection import Client, Listener
+
+import cv2
+import numpy as np
+
+from frame_sources import open_source
+from model_server import AUTHKEY_ENV, auth_key
+
+HOST = '127.0.0.1'
+PORT = int(os.environ.get('NEUROTASK_CAMERA_PORT', '6102'))
+
+MAX_CONSUMERS = 8
+HEADER_WORDS = 8
+# header: write_seq, closed, height, width, channels, slots
+WRITE_SEQ, CLOSED, HEIGHT, WIDTH, CHANNELS, SLOTS = range(6)
+# consumer table rows: pid, cursor, delivered, dropped
+PID, CURSOR, DELIVERED, DROPPED = range(4)
+
+
+def ring_layout(shape, slots):
+    # Byte offsets of the header, per-slot sequence numbers, consumer table
+    # and frame slots inside one shared-memory block
+    header = HEADER_WORDS * 8
+    slot_seqs = header + slots * 8
+    consumers = slot_seqs + MAX_CONSUMERS * 4 * 8
+    total = consumers + slots * int(np.prod(shape))
+    return header, slot_seqs, consumers, total
+
+
+class FrameRing:
+    # Fixed-size ring of frames in shared memory. One writer (the broker)
+    # stamps every slot with the sequence number of the frame it holds so
+    # readers can tell when a slot was overwritten under them.
+    def __init__(self, shm, shape=None, slots=None, create=False):
+        self.shm = shm
+        header = np.ndarray((HEADER_WORDS,), dtype=np.int64, buffer=shm.buf)
+        if create:
+            header[:] = 0
+            header[HEIGHT:CHANNELS + 1] = shape
+            header[SLOTS] = slots
+        self.shape = tuple(int(v) for v in header[HEIGHT:CHANNELS + 1])
+        self.slots = int(header[SLOTS])
+        seqs_at, consumers_at, frames_at, _ = ring_layout(self.shape, self.slots)
+        self.header = header
+        self.slot_seqs = np.ndarray((self.slots,), dtype=np.int64, buffer=shm.buf, offset=seqs_at)
+        self.consumers = np.ndarray((MAX_CONSUMERS, 4), dtype=np.int64, buffer=shm.buf,
+                                    offset=consumers_at)
+        self.frames = np.ndarray((self.slots,) + self.shape, dtype=np.uint8, buffer=shm.buf,
+                                 offset=frames_at)
+        if create:
+            self.slot_seqs[:] = -1
+            self.consumers[:] = 0
+
+    @classmethod
+    def create(cls, shape, slots):
+        size = ring_layout(shape, slots)[3]
+        return cls(shared_memory.SharedMemory(create=True, size=size), shape, slots, create=True)
+
+    @classmethod
+    def attach(cls, name):
+        shm = shared_memory.SharedMemory(name=name)
+        # The broker owns the block; don't let this process's tracker unlink it.
+        # Only POSIX registers it (and Windows can't start a tracker at all).
+        if os.name == 'posix':
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        return cls(shm)
+
+    @property
+    def write_seq(self):
+        return int(self.header[WRITE_SEQ])
+
+    @property
+    def closed(self):
+        return bool(self.header[CLOSED])
+
+    def publish(self, frame):
+        seq = self.write_seq
+        slot = seq % self.slots
+        self.slot_seqs[slot] = -1
+        if frame.shape != self.shape:
+            frame = cv2.resize(frame, (self.shape[1], self.shape[0]))
+        self.frames[slot] = frame
+        self.slot_seqs[slot] = seq
+        self.header[WRITE_SEQ] = seq + 1
+
+    def view(self, seq):
+        # Zero-copy view of frame `seq`, or None if it is no longer (or not
+        # yet) in the ring. Check still_valid() after using the view.
+        slot = seq % self.slots
+        if self.slot_seqs[slot] != seq:
+            return None
+        return self.frames[slot]
+
+    def still_valid(self, seq):
+        return self.slot_seqs[seq % self.slots] == seq
+
+    def close(self):
+        self.header[CLOSED] = 1
+
+    def release(self, unlink=False):
+        # Drop our numpy views first or SharedMemory.close() refuses
+        self.header = self.slot_seqs = self.consumers = self.frames = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+class BrokeredDevice:
+    def __init__(self, spec, slots, fps):
+        self.spec = spec
+        self.cap = open_source(spec)
+        if not self.cap.isOpened():
+            self.cap.release()
+            raise RuntimeError(f"Source {spec} not accessible")
+        ret, frame = self.cap.read()
+        if not ret:
+            self.cap.release()
+            raise RuntimeError(f"Source {spec} can't read frames")
+        self.ring = FrameRing.create(frame.shape, slots)
+        self.ring.publish(frame)
+        self.interval = 1.0 / fps if fps else 0.0
+        self.consumers = set()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.capture_loop, daemon=True)
+        self.thread.start()
+
+    def capture_loop(self):
+        next_time = time.perf_counter()
+        while not self.stopped.is_set():
+            ret, frame = self.cap.read()
+            if not ret:
+                break
+            self.ring.publish(frame)
+            if self.interval:
+                next_time += self.interval
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    self.stopped.wait(delay)
+                else:
+                    next_time = time.perf_counter()
+        self.ring.close()
+
+    def add_consumer(self, pid):
+        free = [i for i in range(MAX_CONSUMERS) if i not in self.consumers]
+        if not free:
+            raise RuntimeError(f"Too many consumers for {self.spec}")
+        index = free[0]
+        # New consumers start at the newest frame, not at the start of the ring
+        self.ring.consumers[index] = (pid, max(0, self.ring.write_seq - 1), 0, 0)
+        self.consumers.add(index)
+        return index
+
+    def remove_consumer(self, index):
+        self.consumers.discard(index)
+        self.ring.consumers[index] = 0
+
+    def stats(self):
+        return {'frames': self.ring.write_seq,
+                'consumers': [dict(zip(('pid', 'cursor', 'delivered', 'dropped'),
+                                       (int(v) for v in self.ring.consumers[index])))
+                              for index in sorted(self.consumers)]}
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join(timeout=2)
+        self.cap.release()
+        self.ring.close()
+        self.ring.release(unlink=True)
+
+
+class CameraBroker:
+    # Owns every physical camera (or file/synthetic source) on this machine
+    # and publishes its frames through a shared-memory ring. Tools attach
+    # over a local socket and then read frames straight from shared memory;
+    # a device is released once its last consumer detaches.
+    def __init__(self, host=HOST, port=PORT, slots=4, fps=30.0):
+        # Same rule as the model server: no key, no socket
+        key = auth_key()
+        if key is None:
+            raise RuntimeError(f"{AUTHKEY_ENV} is not set; start the broker from main.py "
+                               f"or set it to a random secret")
+        self.listener = Listener((host, port), authkey=key)
+        self.slots = slots
+        self.fps = fps
+        self.devices = {}
+        self.lock = threading.Lock()
+
+    def attach(self, spec, pid):
+        with self.lock:
+            device = self.devices.get(spec)
+            if device is None:
+                device = BrokeredDevice(spec, self.slots, self.fps)
+                self.devices[spec] = device
+                print(f"📷 Opened {spec} {device.ring.shape} for sharing")
+            index = device.add_consumer(pid)
+            return device.ring.shm.name, index
+
+    def detach(self, spec, index):
+        with self.lock:
+            device = self.devices.get(spec)
+            if device is None:
+                return
+            device.remove_consumer(index)
+            if not device.consumers:
+                device.stop()
+                del self.devices[spec]
+                print(f"📷 Released {spec}")
+
+    def handle(self, op, args, attached):
+        if op == 'ping':
+            return 'pong'
+        if op == 'attach':
+            spec, pid = args
+            name, index = self.attach(str(spec), pid)
+            attached.append((str(spec), index))
+            return name, index
+        if op == 'detach':
+            spec, index = args
+            if (spec, index) in attached:
+                attached.remove((spec, index))
+                self.detach(spec, index)
+            return True
+        if op == 'stats':
+            with self.lock:
+                return {spec: device.stats() for spec, device in self.devices.items()}
+        raise ValueError(f"Unknown request: {op}")
+
+    def serve_connection(self, conn):
+        # Anything still attached when a tool disconnects (or crashes) is released
+        attached = []
+        with conn:
+            while True:
+                try:
+                    op, args = conn.recv()
+                except (EOFError, OSError):
+                    break
+                try:
+                    conn.send(('ok', self.handle(op, args, attached)))
+                except Exception as e:
+                    conn.send(('error', str(e)))
+        for spec, index in attached:
+            self.detach(spec, index)
+
+    def serve_forever(self):
+        print(f"🟢 Camera broker listening on {self.listener.address}")
+        while True:
+            try:
+                conn = self.listener.accept()
+            except Exception as e:
+                print(f"⚠️ Rejected connection: {e}")
+                continue
+            threading.Thread(target=self.serve_connection, args=(conn,), daemon=True).start()
+
+
+class SharedCamera:
+    # cv2.VideoCapture-like reader over a brokered device. Each reader keeps
+    # its own cursor; a reader that falls more than a ring behind skips ahead
+    # and counts the frames it missed in `dropped`. release() may come from
+    # another thread than the one reading (a CaptureThread that is still
+    # inside read()), so reads and release share a lock and a stop flag.
+    def __init__(self, conn, spec, poll_interval=0.002, timeout=2.0):
+        self.conn = conn
+        self.lock = threading.RLock()
+        self.stopping = threading.Event()
+        self.spec = str(spec)
+        self.name = f"shared:{self.spec}"
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        name, self.index = self.call('attach', self.spec, os.getpid())
+        self.ring = FrameRing.attach(name)
+        self.entry = self.ring.consumers[self.index]
+        self.cursor = int(self.entry[CURSOR])
+        self.delivered = 0
+        self.dropped = 0
+
+    def call(self, op, *args):
+        self.conn.send((op, args))
+        status, result = self.conn.recv()
+        if status == 'error':
+            raise RuntimeError(result)
+        return result
+
+    def next_seq(self):
+        deadline = time.perf_counter() + self.timeout
+        while self.ring.write_seq <= self.cursor:
+            if self.stopping.is_set() or self.ring.closed or time.perf_counter() > deadline:
+                return None
+            time.sleep(self.poll_interval)
+        oldest = self.ring.write_seq - self.ring.slots + 1
+        if self.cursor < oldest:
+            self.dropped += oldest - self.cursor
+            self.cursor = oldest
+        return self.cursor
+
+    def read_view(self):
+        # Zero-copy: the array aliases the ring slot and is only valid until
+        # the broker wraps around to it; check still_valid(seq) afterwards.
+        with self.lock:
+            return self._read_view()
+
+    def _read_view(self):
+        while self.ring is not None and not self.stopping.is_set():
+            seq = self.next_seq()
+            if seq is None:
+                return None, None
+            frame = self.ring.view(seq)
+            self.cursor = seq + 1
+            if frame is None:
+                self.dropped += 1
+                continue
+            self.delivered += 1
+            self.entry[CURSOR:] = (self.cursor, self.delivered, self.dropped)
+            return seq, frame
+        return None, None
+
+    def still_valid(self, seq):
+        with self.lock:
+            return self.ring is not None and self.ring.still_valid(seq)
+
+    def read(self):
+        # One copy out of the ring, for consumers that keep frames around
+        with self.lock:
+            return self._read()
+
+    def _read(self):
+        while True:
+            seq, frame = self._read_view()
+            if frame is None:
+                return False, None
+            frame = frame.copy()
+            if self.ring.still_valid(seq):
+                return True, frame
+            self.delivered -= 1
+            self.dropped += 1
+            self.entry[CURSOR:] = (self.cursor, self.delivered, self.dropped)
+
+    def isOpened(self):
+        ring = self.ring
+        return ring is not None and not ring.closed
+
+    def release(self):
+        # Wake a reader waiting in next_seq() and wait for it to leave
+        self.stopping.set()
+        with self.lock:
+            if self.ring is None:
+                return
+            self.entry = None
+            try:
+                self.ring.release()
+            except BufferError:
+                # A caller still holds a read_view() frame; the mapping goes
+                # away with the last reference instead
+                pass
+            self.ring = None
+        try:
+            self.call('detach', self.spec, self.index)
+        except (OSError, EOFError, RuntimeError):
+            pass
+        self.conn.close()
+
+
+def open_shared_camera(spec, host=HOST, port=PORT):
+    # A SharedCamera if a broker is running, otherwise None so the caller can
+    # fall back to opening the device directly
+    key = auth_key()
+    if key is None:
+        return None
+    try:
+        conn = Client((host, port), authkey=key)
+    except Exception:
+        return None
+    try:
+        return SharedCamera(conn, spec)
+    except Exception as e:
+        print(f"⚠️ Camera broker could not share {spec}: {e}")
+        conn.close()
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Share cameras between NeuroTask tools")
+    parser.add_argument('--slots', type=int, default=4, help="frames kept per device")
+    parser.add_argument('--fps', type=float, default=30.0,
+                        help="publish rate cap, mostly for file and synthetic sources (0 = none)")
+    parser.add_argument('--stats', action='store_true',
+                        help="print per-consumer cursors and drops of a running broker")
+    args = parser.parse_args()
+
+    if args.stats:
+        if auth_key() is None:
+            raise SystemExit(f"❌ {AUTHKEY_ENV} is not set; use the key the launcher was started with")
+        try:
+            conn = Client((HOST, PORT), authkey=auth_key())
+        except Exception as e:
+            raise SystemExit(f"❌ No camera broker running: {e}")
+        conn.send(('stats', ()))
+        for spec, stats in conn.recv()[1].items():
+            print(f"{spec}: {stats['frames']} frames published")
+            for consumer in stats['consumers']:
+                print(f"   pid {consumer['pid']}: {consumer['delivered']} delivered, "
+                      f"{consumer['dropped']} dropped")
+        conn.close()
+    else:
+        try:
+            broker = CameraBroker(slots=args.slots, fps=args.fps or None)
+        except RuntimeError as e:
+            raise SystemExit(f"❌ {e}")
+        except OSError as e:
+            raise SystemExit(f"❌ Camera broker already running or port busy: {e}")
+        broker.serve_forever()
@@ -0,0 +1,183 @@
+import argparse
+import csv
+import json
+import queue
+import sys
+import threading
+import time
+
+from adaptive_detection import AdaptiveDetector
+from detector import FILES_EXIST, BatchObjectDetector, ObjectDetector, load_class_names
+from frame_pipeline import BatchCollector, FramePacket
+from frame_sources import open_source
+from process_pool import ProcessDetectorPool
+
+CSV_FIELDS = ['frame', 'class', 'confidence', 'x', 'y', 'w', 'h']
+
+
+class JsonlWriter:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, frame_index, class_name, confidence, box):
+        self.stream.write(json.dumps({
+            'frame': frame_index,
+            'class': class_name,
+            'confidence': round(confidence, 4),
+            'box': list(box)
+        }) + "\n")
+
+
+class CsvWriter:
+    def __init__(self, stream):
+        self.writer = csv.writer(stream)
+        self.writer.writerow(CSV_FIELDS)
+
+    def write(self, frame_index, class_name, confidence, box):
+        self.writer.writerow([frame_index, class_name, f"{confidence:.4f}", *box])
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Headless SSD MobileNet object detection over videos, images or synthetic frames")
+    parser.add_argument('source',
+                        help="video file, image directory/glob, camera index or 'synthetic[:WxH]'")
+    parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl')
+    parser.add_argument('--output', '-o', default='-', help="output file ('-' for stdout)")
+    parser.add_argument('--max-frames', type=int, default=None)
+    parser.add_argument('--conf', type=float, default=0.5, help="confidence threshold")
+    parser.add_argument('--batch-size', type=int, default=1,
+                        help="frames per forward pass (>1 uses the batched NCHW path)")
+    parser.add_argument('--max-wait-ms', type=float, default=20.0,
+                        help="longest time to wait for a batch to fill up")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="run detection in N worker processes fed through shared memory")
+    parser.add_argument('--adaptive', action='store_true',
+                        help="run the SSD every K frames (or on scene change) and track in between")
+    parser.add_argument('--detect-interval', type=int, default=5, help="K for --adaptive")
+    parser.add_argument('--diff-threshold', type=float, default=12.0,
+                        help="mean frame difference (0-255) that forces a detection")
+    parser.add_argument('--target-fps', type=float, default=None,
+                        help="with --adaptive, tune K to hold this frame rate")
+    return parser.parse_args(argv)
+
+
+def read_frames(source, out_queue, max_frames):
+    index = 0
+    while max_frames is None or index < max_frames:
+        ret, frame = source.read()
+        if not ret:
+            break
+        out_queue.put(FramePacket(index, frame))
+        index += 1
+    out_queue.put(None)
+
+
+def run(args):
+    if not FILES_EXIST:
+        print("❌ Missing files: coco.names, .pbtxt, .pb", file=sys.stderr)
+        return 1
+
+    source = open_source(args.source, max_frames=args.max_frames)
+    if not source.isOpened():
+        print(f"❌ Could not open source: {args.source}", file=sys.stderr)
+        return 1
+
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', newline='')
+    writer = JsonlWriter(out) if args.format == 'jsonl' else CsvWriter(out)
+    if args.workers > 0:
+        return run_pool(args, source, writer, out)
+
+    if args.batch_size > 1:
+        detector = BatchObjectDetector(conf_threshold=args.conf)
+    else:
+        detector = ObjectDetector(conf_threshold=args.conf)
+    if args.adaptive:
+        detector = AdaptiveDetector(detector, interval=args.detect_interval,
+                                    diff_threshold=args.diff_threshold, target_fps=args.target_fps)
+
+    frame_queue = queue.Queue(maxsize=max(2, args.batch_size * 2))
+    threading.Thread(target=read_frames, args=(source, frame_queue, args.max_frames),
+                     daemon=True).start()
+    collector = BatchCollector(frame_queue, args.batch_size, args.max_wait_ms / 1000)
+
+    frames = 0
+    detections = 0
+    start = time.perf_counter()
+    try:
+        while True:
+            batch = collector.next_batch()
+            if not batch:
+                break
+            results = detector.detect_batch([packet.frame for packet in batch])
+            for packet, found in zip(batch, results):
+                for classId, confidence, box in found:
+                    writer.write(packet.index, detector.class_name(classId), confidence, box)
+                    detections += 1
+            frames += len(batch)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        source.release()
+        if out is not sys.stdout:
+            out.close()
+
+    report(frames, detections, time.perf_counter() - start)
+    if args.adaptive:
+        print(f"🔁 SSD ran on {detector.detections_run}/{detector.frames_seen} frames "
+              f"(final K={detector.interval})", file=sys.stderr)
+    return 0
+
+
+def run_pool(args, source, writer, out):
+    class_names = load_class_names()
+    frames = 0
+    submitted = 0
+    detections = 0
+    exhausted = False
+    start = time.perf_counter()
+    pool = ProcessDetectorPool(workers=args.workers, conf_threshold=args.conf)
+    try:
+        while not exhausted or pool.in_flight:
+            while not exhausted and pool.has_capacity():
+                if args.max_frames is not None and submitted >= args.max_frames:
+                    exhausted = True
+                    break
+                ret, frame = source.read()
+                if not ret:
+                    exhausted = True
+                    break
+                pool.submit(frame, submitted)
+                submitted += 1
+            for index, found, _ in pool.collect(timeout=0.05):
+                if isinstance(found, Exception):
+                    print(f"⚠️ Frame {index} failed: {found}", file=sys.stderr)
+                    found = []
+                for classId, confidence, box in found:
+                    name = class_names[classId - 1] if 0 < classId <= len(class_names) else str(classId)
+                    writer.write(index, name, confidence, box)
+                    detections += 1
+                frames += 1
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    finally:
+        pool.close()
+        source.release()
+        if out is not sys.stdout:
+            out.close()
+
+    report(frames, detections, time.perf_counter() - start)
+    return 0
+
+
+def report(frames, detections, elapsed):
+    fps = frames / elapsed if elapsed > 0 else 0.0
+    print(f"📊 {frames} frames, {detections} detections in {elapsed:.2f}s ({fps:.1f} FPS)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(run(parse_args()))
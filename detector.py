@@ -0,0 +1,100 @@
+import os
+import cv2
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+classFile = os.path.join(BASE_DIR, "coco.names")
+configPath = os.path.join(BASE_DIR, "ssd_mobilenet_v3_large_coco_2020_01_14.pbtxt")
+weightsPath = os.path.join(BASE_DIR, "frozen_inference_graph.pb")
+
+FILES_EXIST = all(os.path.exists(f) for f in [classFile, configPath, weightsPath])
+
+INPUT_SIZE = (320, 320)
+INPUT_SCALE = 1 / 127.5
+INPUT_MEAN = (127.5, 127.5, 127.5)
+
+
+def load_class_names(path=classFile):
+    with open(path, "r") as f:
+        return f.read().strip().split("\n")
+
+
+def load_detection_model():
+    net = cv2.dnn_DetectionModel(weightsPath, configPath)
+    net.setInputSize(*INPUT_SIZE)
+    net.setInputScale(INPUT_SCALE)
+    net.setInputMean(INPUT_MEAN)
+    net.setInputSwapRB(True)
+    return net
+
+
+class ObjectDetector:
+    # Thin wrapper around the SSD MobileNet model shared by the GUI and the
+    # headless CLI. Detections are (class_id, confidence, (x, y, w, h)).
+    def __init__(self, conf_threshold=0.5):
+        self.conf_threshold = conf_threshold
+        self.classNames = load_class_names()
+        self.net = load_detection_model()
+
+    def detect(self, frame):
+        classIds, confs, boxes = self.net.detect(frame, confThreshold=self.conf_threshold)
+        if len(classIds) == 0:
+            return []
+        return [(int(classId), float(confidence), tuple(int(v) for v in box))
+                for classId, confidence, box in zip(classIds.flatten(), confs.flatten(), boxes)]
+
+    def detect_batch(self, frames):
+        return [self.detect(frame) for frame in frames]
+
+    def class_name(self, class_id):
+        if 0 < class_id <= len(self.classNames):
+            return self.classNames[class_id - 1]
+        return str(class_id)
+
+
+class BatchObjectDetector:
+    # Runs N frames through the SSD graph in a single forward pass. The
+    # DetectionOutput layer tags every row with the index of the image it
+    # came from, which is used to split the output back per frame.
+    def __init__(self, conf_threshold=0.5):
+        self.conf_threshold = conf_threshold
+        self.classNames = load_class_names()
+        self.net = cv2.dnn.readNetFromTensorflow(weightsPath, configPath)
+
+    def detect_batch(self, frames):
+        if not frames:
+            return []
+        blob = cv2.dnn.blobFromImages(frames, INPUT_SCALE, INPUT_SIZE, INPUT_MEAN, swapRB=True)
+        self.net.setInput(blob)
+        rows = self.net.forward().reshape(-1, 7)
+        rows = rows[rows[:, 2] >= self.conf_threshold]
+        
+        results = [[] for _ in frames]
+        for image_id, classId, confidence, x1, y1, x2, y2 in rows:
+            index = int(image_id)
+            if not 0 <= index < len(frames):
+                continue
+            h, w = frames[index].shape[:2]
+            left = max(0, min(w - 1, int(x1 * w)))
+            top = max(0, min(h - 1, int(y1 * h)))
+            right = max(left + 1, min(w, int(x2 * w)))
+            bottom = max(top + 1, min(h, int(y2 * h)))
+            results[index].append((int(classId), float(confidence),
+                                   (left, top, right - left, bottom - top)))
+        return results
+
+    def detect(self, frame):
+        return self.detect_batch([frame])[0]
+
+    def class_name(self, class_id):
+        if 0 < class_id <= len(self.classNames):
+            return self.classNames[class_id - 1]
+        return str(class_id)
+
+
+def draw_detections(frame, detections, class_name):
+    for classId, confidence, box in detections:
+        label = f"{class_name(classId)} {confidence:.2f}"
+        cv2.rectangle(frame, box, (0, 255, 0), 2)
+        cv2.putText(frame, label, (box[0], box[1] - 10),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+    return frame
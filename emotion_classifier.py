@@ -0,0 +1,63 @@
+import cv2
+import numpy as np
+
+EMOTION_LABELS = ["angry", "disgust", "fear", "happy", "sad", "surprise", "neutral"]
+FACE_OFFSET = 10
+PADDING = 40
+
+
+class BatchEmotionClassifier:
+    # Drop-in for FER.detect_emotions: faces are found once with the shared
+    # Haar detector, every crop is stacked into a single (N, 48, 48, 1) batch
+    # and FER's emotion model runs once per frame however many faces are in
+    # view. Falls back to FER itself if its model cannot be reached.
+    def __init__(self, fer_detector, face_detector):
+        self.fer = fer_detector
+        self.face_detector = face_detector
+        self.model = getattr(fer_detector, '_FER__emotion_classifier', None)
+        self.target_size = (48, 48)
+        if self.model is not None:
+            try:
+                height, width = self.model.input_shape[1:3]
+                self.target_size = (width, height)
+            except Exception:
+                pass
+
+    def _crop(self, padded, box):
+        x, y, w, h = box
+        # Square up the box and add FER's margin before cropping
+        side = max(w, h)
+        x -= (side - w) // 2
+        y -= (side - h) // 2
+        x1, y1 = x - FACE_OFFSET + PADDING, y - FACE_OFFSET + PADDING
+        x2, y2 = x + side + FACE_OFFSET + PADDING, y + side + FACE_OFFSET + PADDING
+        crop = padded[max(0, y1):y2, max(0, x1):x2]
+        if crop.size == 0:
+            return None
+        return cv2.resize(crop, self.target_size)
+
+    def classify(self, gray, boxes):
+        padded = cv2.copyMakeBorder(gray, PADDING, PADDING, PADDING, PADDING, cv2.BORDER_CONSTANT)
+        crops, kept = [], []
+        for box in boxes:
+            crop = self._crop(padded, box)
+            if crop is not None:
+                crops.append(crop)
+                kept.append(box)
+        if not crops:
+            return []
+        batch = np.stack(crops).astype(np.float32) / 255.0
+        batch = ((batch - 0.5) * 2.0)[..., np.newaxis]
+        predictions = np.asarray(self.model.predict_on_batch(batch))
+        return [{"box": [int(v) for v in box],
+                 "emotions": {label: round(float(score), 2)
+                              for label, score in zip(EMOTION_LABELS, scores)}}
+                for box, scores in zip(kept, predictions)]
+
+    def detect_emotions(self, frame, face_rectangles=None):
+        if self.model is None:
+            return self.fer.detect_emotions(frame, face_rectangles=face_rectangles)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if face_rectangles is None:
+            face_rectangles = self.face_detector.detect(gray)
+        return self.classify(gray, face_rectangles)
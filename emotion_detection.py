@@ -1,35 +1,103 @@
+import threading
 import cv2
+import numpy as np
 import tkinter as tk
 from tkinter import messagebox
+from PIL import Image, ImageTk
+from camera_broker import open_shared_camera
+from emotion_classifier import BatchEmotionClassifier
+from face_detector import get_face_detector
+from face_tracking import FaceEmotionTracker
+from model_server import (RemoteEmotionDetector, StatsReporter, benchmark_mode,
+                          connect_model_server, report_first_inference, report_ready,
+                          server_has)
+from frame_pipeline import DetectionPipeline
 
-try:
-    from fer import FER
-    FER_AVAILABLE = True
-    print("✅ FER library loaded!")
-except Exception as e:
-    FER_AVAILABLE = False
-    print(f"❌ FER not available: {e}")
+DISPLAY_SIZE = (640, 480)
+# The server loads FER after SSD MobileNet; a local FER load costs about as
+# much, so a server that is still loading gets a while before we start one
+SERVER_FER_WAIT = 30.0
 
 class EmotionDetection:
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("😊 Emotion Detection")
-        self.root.geometry("500x400")
+        self.root.geometry("760x820")
         self.root.configure(bg='#0f172a')
         
         self.is_running = False
+        self.cap = None
+        self.pipeline = None
+        self.tracker = None
+        self.face_detector = None
+        self.emotion_detector = None
+        self.client = None
+        self.models_loaded = threading.Event()
+        self.stats_reporter = StatsReporter()
         
-        if FER_AVAILABLE:
+        # Show the window first; FER/TensorFlow import and load in the background
+        self.setup_gui()
+        threading.Thread(target=self.load_models, daemon=True).start()
+        self.root.after(50, self.check_models)
+    
+    def load_models(self):
+        try:
+            self.face_detector = get_face_detector()
+            
+            self.emotion_detector = self.attach_emotion_detector()
+            
+            # Warm-up pass so the first real frame doesn't pay for lazy setup
+            warmup = np.zeros((DISPLAY_SIZE[1], DISPLAY_SIZE[0], 3), dtype=np.uint8)
             try:
-                self.emotion_detector = FER(mtcnn=False)
-                print("✅ Emotion detector initialized!")
+                if self.emotion_detector:
+                    self.emotion_detector.detect_emotions(warmup)
+                else:
+                    self.face_detector.detect(warmup)
             except Exception as e:
-                print(f"❌ Failed to init detector: {e}")
-                self.emotion_detector = None
-        else:
-            self.emotion_detector = None
-        
-        self.setup_gui()
+                print(f"⚠️ Warm-up failed: {e}")
+            report_first_inference("emotion_detection.py")
+        except Exception as e:
+            print(f"❌ Failed to load models: {e}")
+        self.models_loaded.set()
+    
+    def attach_emotion_detector(self):
+        # Prefer the already-warm FER in the model server over loading a copy
+        self.client = connect_model_server()
+        if self.client:
+            try:
+                if server_has(self.client, 'fer', SERVER_FER_WAIT):
+                    print("✅ Using the shared model server")
+                    return RemoteEmotionDetector(self.client)
+            except Exception as e:
+                print(f"⚠️ Model server not usable: {e}")
+            self.client.close()
+            self.client = None
+        try:
+            from fer import FER
+            print("✅ FER library loaded!")
+            # Faces found once per frame, all crops classified in one batch
+            detector = BatchEmotionClassifier(FER(mtcnn=False), self.face_detector)
+            print("✅ Emotion detector initialized!")
+            return detector
+        except Exception as e:
+            print(f"❌ FER not available: {e}")
+            return None
+    
+    def check_models(self):
+        if not self.models_loaded.is_set():
+            self.root.after(50, self.check_models)
+            return
+        if not self.face_detector:
+            self.status_label.config(text="Status: Face detector failed to load ❌", fg='#ef4444')
+            if benchmark_mode():
+                self.root.destroy()
+            return
+        if not self.emotion_detector:
+            self.notice_label.config(text="⚠️ FER not working - only face detection available")
+        self.status_label.config(text="Status: Idle", fg='white')
+        self.start_btn.config(state='normal')
+        if benchmark_mode():
+            self.root.destroy()
     
     def setup_gui(self):
         header = tk.Frame(self.root, bg='#f59e0b', height=80)
@@ -41,24 +109,24 @@ class EmotionDetection:
         container = tk.Frame(self.root, bg='#1e293b', relief='raised', bd=2)
         container.pack(fill='both', expand=True, padx=20, pady=20)
         
-        if FER_AVAILABLE and self.emotion_detector:
-            tk.Label(container, text="Camera will open in separate window",
-                    font=('Helvetica', 12), bg='#1e293b', fg='#10b981').pack(pady=20)
-        else:
-            tk.Label(container, text="⚠️ FER not working - only face detection available",
-                    font=('Helvetica', 11), bg='#1e293b', fg='#f59e0b').pack(pady=20)
+        self.notice_label = tk.Label(container, text="", font=('Helvetica', 11),
+                                     bg='#1e293b', fg='#f59e0b')
+        self.notice_label.pack(pady=(10, 0))
+        
+        self.video_label = tk.Label(container, bg='black')
+        self.video_label.pack(padx=20, pady=10)
         
-        self.status_label = tk.Label(container, text="Status: Idle", 
+        self.status_label = tk.Label(container, text="Status: Loading models... ⏳", 
                                      font=('Helvetica', 12, 'bold'), bg='#1e293b', fg='white')
-        self.status_label.pack(pady=20)
+        self.status_label.pack(pady=5)
         
         btn_frame = tk.Frame(container, bg='#1e293b')
-        btn_frame.pack(pady=20)
+        btn_frame.pack(pady=10)
         
         self.start_btn = tk.Button(btn_frame, text="▶️ Start Detection", 
                                    command=self.start_detection,
                                    bg='#10b981', fg='white', font=('Helvetica', 13, 'bold'),
-                                   relief='flat', padx=30, pady=12, cursor='hand2')
+                                   relief='flat', padx=30, pady=12, cursor='hand2', state='disabled')
         self.start_btn.pack(side='left', padx=10)
         
         self.stop_btn = tk.Button(btn_frame, text="⏹️ Stop Detection", 
@@ -68,7 +136,7 @@ class EmotionDetection:
         self.stop_btn.pack(side='left', padx=10)
         
         camera_frame = tk.Frame(container, bg='#1e293b')
-        camera_frame.pack(pady=10)
+        camera_frame.pack(pady=5)
         
         tk.Label(camera_frame, text="Camera:", font=('Helvetica', 10),
                 bg='#1e293b', fg='white').pack(side='left', padx=(0, 10))
@@ -81,123 +149,157 @@ class EmotionDetection:
                       bg='#1e293b', fg='white', selectcolor='#334155',
                       font=('Helvetica', 10)).pack(side='left', padx=5)
         
-        tk.Label(container, text="💡 Press 'Q' in camera window to stop",
-                bg='#1e293b', fg='#94a3b8', font=('Helvetica', 9)).pack(pady=10)
+        self.track_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(container, text="Track faces and smooth emotions", variable=self.track_var,
+                      bg='#1e293b', fg='white', selectcolor='#334155',
+                      font=('Helvetica', 10)).pack(pady=5)
     
     def start_detection(self):
         print("🔵 Starting detection...")
         camera_index = int(self.camera_var.get())
         
-        self.is_running = True
-        self.start_btn.config(state='disabled')
-        self.stop_btn.config(state='normal')
-        self.status_label.config(text="Status: Running ✅", fg='#10b981')
-        
         try:
-            cap = cv2.VideoCapture(camera_index)
+            # Share the camera through the broker when one is running
+            self.cap = open_shared_camera(camera_index) or cv2.VideoCapture(camera_index)
             
-            if not cap.isOpened():
+            if not self.cap.isOpened():
                 raise RuntimeError(f"Camera {camera_index} not accessible")
             
             print("✅ Camera opened!")
-            
-            while self.is_running:
-                ret, frame = cap.read()
-                
-                if not ret:
-                    print("❌ Can't read frame")
-                    break
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            messagebox.showerror("Error", f"Camera error:\n{str(e)}\n\nTry the other camera option.")
+            if self.cap:
+                self.cap.release()
+                self.cap = None
+            return
+        
+        self.is_running = True
+        self.start_btn.config(state='disabled')
+        self.stop_btn.config(state='normal')
+        self.status_label.config(text="Status: Running ✅", fg='#10b981')
+        
+        self.tracker = None
+        if self.emotion_detector and self.track_var.get():
+            self.tracker = FaceEmotionTracker(self.emotion_detector, self.face_detector)
+        
+        # Capture and emotion inference run on worker threads; the Tk thread
+        # only displays the newest annotated frame, so Stop reacts at once.
+        self.pipeline = DetectionPipeline({camera_index: self.cap}, self.process_batch)
+        self.pipeline.start()
+        self.render()
+    
+    def process_batch(self, packets):
+        for packet in packets:
+            frame = self.annotate(packet.frame)
+            frame = cv2.resize(frame, DISPLAY_SIZE)
+            packet.frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        return packets
+    
+    def annotate(self, frame):
+        # Try emotion detection if available
+        if self.emotion_detector:
+            try:
+                if self.tracker:
+                    results = self.tracker.process(frame)
+                else:
+                    results = self.emotion_detector.detect_emotions(frame)
                 
-                # Try emotion detection if available
-                if self.emotion_detector:
-                    try:
-                        results = self.emotion_detector.detect_emotions(frame)
+                if results:
+                    for result in results:
+                        x, y, w, h = result["box"]
+                        emotions = result["emotions"]
+                        top_emotion = max(emotions, key=emotions.get)
+                        confidence = emotions[top_emotion]
                         
-                        if results:
-                            for result in results:
-                                x, y, w, h = result["box"]
-                                emotions = result["emotions"]
-                                top_emotion = max(emotions, key=emotions.get)
-                                confidence = emotions[top_emotion]
-                                
-                                # Draw rectangle
-                                cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
-                                
-                                # Show top emotion
-                                label = f"{top_emotion} ({confidence*100:.1f}%)"
-                                cv2.putText(frame, label, (x, y-10),
-                                           cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 0, 0), 2)
-                                
-                                # Show top 3 emotions
-                                y_offset = y + h + 25
-                                for emotion, score in sorted(emotions.items(), key=lambda x: x[1], reverse=True)[:3]:
-                                    text = f"{emotion}: {score*100:.0f}%"
-                                    cv2.putText(frame, text, (x, y_offset),
-                                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-                                    y_offset += 20
-                        else:
-                            # No face detected
-                            cv2.putText(frame, "No face detected", (10, 30),
-                                       cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
-                    except Exception as e:
-                        print(f"⚠️ Emotion detection error: {e}")
-                        # Fallback to simple face detection
-                        face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-                        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                        faces = face_cascade.detectMultiScale(gray, 1.3, 5)
+                        # Draw rectangle
+                        cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
                         
-                        for (x, y, w, h) in faces:
-                            cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
-                            cv2.putText(frame, "Face (no emotion)", (x, y-10),
-                                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+                        # Show top emotion
+                        label = f"{top_emotion} ({confidence*100:.1f}%)"
+                        cv2.putText(frame, label, (x, y-10),
+                                   cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 0, 0), 2)
+                        
+                        # Show top 3 emotions
+                        y_offset = y + h + 25
+                        for emotion, score in sorted(emotions.items(), key=lambda x: x[1], reverse=True)[:3]:
+                            text = f"{emotion}: {score*100:.0f}%"
+                            cv2.putText(frame, text, (x, y_offset),
+                                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+                            y_offset += 20
                 else:
-                    # Simple face detection only
-                    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                    faces = face_cascade.detectMultiScale(gray, 1.3, 5)
-                    
-                    for (x, y, w, h) in faces:
-                        cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
-                        cv2.putText(frame, "Face Detected", (x, y-10),
-                                   cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 0), 2)
-                    
-                    if len(faces) > 0:
-                        cv2.putText(frame, f"Faces: {len(faces)}", (10, 30),
-                                   cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
-                
-                cv2.imshow('Emotion Detection - Press Q to quit', frame)
-                
-                if cv2.waitKey(1) & 0xFF == ord('q'):
-                    break
+                    # No face detected
+                    cv2.putText(frame, "No face detected", (10, 30),
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
+            except Exception as e:
+                print(f"⚠️ Emotion detection error: {e}")
+                # Fallback to simple face detection
+                faces = self.face_detector.detect(frame)
                 
-                self.root.update()
+                for (x, y, w, h) in faces:
+                    cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
+                    cv2.putText(frame, "Face (no emotion)", (x, y-10),
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+        else:
+            # Simple face detection only
+            faces = self.face_detector.detect(frame)
             
-            cap.release()
-            cv2.destroyAllWindows()
-            print("✅ Camera closed")
+            for (x, y, w, h) in faces:
+                cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
+                cv2.putText(frame, "Face Detected", (x, y-10),
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 0), 2)
             
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            messagebox.showerror("Error", f"Camera error:\n{str(e)}\n\nTry the other camera option.")
+            if len(faces) > 0:
+                cv2.putText(frame, f"Faces: {len(faces)}", (10, 30),
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+        return frame
+    
+    def render(self):
+        if not self.is_running or not self.pipeline:
+            return
         
-        self.stop_detection()
+        packets = self.pipeline.poll()
+        if packets:
+            packet = list(packets.values())[-1]
+            img = ImageTk.PhotoImage(Image.fromarray(packet.frame))
+            self.video_label.config(image=img)
+            self.video_label.image = img
+            self.stats_reporter.report(fps=self.pipeline.fps.fps)
+        elif self.pipeline.finished:
+            print("❌ Can't read frame")
+            self.stop_detection()
+            return
+        
+        self.root.after(5, self.render)
     
     def stop_detection(self):
         print("🔴 Stopping...")
         self.is_running = False
+        self.shutdown_pipeline()
         self.start_btn.config(state='normal')
         self.stop_btn.config(state='disabled')
         self.status_label.config(text="Status: Stopped", fg='#ef4444')
-        cv2.destroyAllWindows()
+        self.video_label.config(image='')
         print("✅ Stopped")
     
+    def shutdown_pipeline(self):
+        # Don't wait for an in-flight emotion inference; its result is dropped
+        if self.pipeline:
+            self.pipeline.stop(timeout=0.2)
+            self.pipeline = None
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+            print("✅ Camera closed")
+    
     def run(self):
         def on_close():
             self.is_running = False
-            cv2.destroyAllWindows()
+            self.shutdown_pipeline()
             self.root.destroy()
         
         self.root.protocol("WM_DELETE_WINDOW", on_close)
+        self.root.after_idle(lambda: report_ready("emotion_detection.py"))
         self.root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,46 @@
+import threading
+import cv2
+
+CASCADE_PATH = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+
+
+class FaceDetector:
+    # Haar cascade face detector that parses the cascade XML once and runs
+    # on a downscaled grayscale copy of the frame. Boxes are returned as
+    # (x, y, w, h) in the coordinates of the original frame.
+    def __init__(self, cascade_path=CASCADE_PATH, detect_width=320,
+                 scale_factor=1.3, min_neighbors=5, min_size=(30, 30)):
+        self.cascade = cv2.CascadeClassifier(cascade_path)
+        if self.cascade.empty():
+            raise RuntimeError(f"Could not load face cascade: {cascade_path}")
+        self.detect_width = detect_width
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.min_size = min_size
+        self.lock = threading.Lock()
+
+    def detect(self, frame):
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        scale = min(1.0, self.detect_width / gray.shape[1])
+        small = gray
+        if scale < 1.0:
+            small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        min_size = (max(1, int(self.min_size[0] * scale)), max(1, int(self.min_size[1] * scale)))
+        with self.lock:
+            faces = self.cascade.detectMultiScale(small, self.scale_factor, self.min_neighbors,
+                                                  minSize=min_size)
+        return [(int(x / scale), int(y / scale), int(w / scale), int(h / scale))
+                for (x, y, w, h) in faces]
+
+
+_shared_detector = None
+_shared_lock = threading.Lock()
+
+
+def get_face_detector():
+    # One preloaded detector per process, shared by every tool and thread
+    global _shared_detector
+    with _shared_lock:
+        if _shared_detector is None:
+            _shared_detector = FaceDetector()
+        return _shared_detector
@@ -0,0 +1,112 @@
+import itertools
+import cv2
+
+THUMB_SIZE = (24, 24)
+
+
+def iou(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    ix = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    iy = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = ix * iy
+    union = aw * ah + bw * bh - inter
+    return inter / union if union > 0 else 0.0
+
+
+class TrackedFace:
+    def __init__(self, face_id, box):
+        self.id = face_id
+        self.box = box
+        self.emotions = None
+        self.thumb = None
+        self.since_classified = 0
+        self.missed = 0
+
+
+class FaceEmotionTracker:
+    # Follows faces across frames by IoU and only re-runs the emotion
+    # classifier for a face every `reclassify_every` frames or when its crop
+    # changed noticeably. Scores are smoothed per face with an exponential
+    # moving average, which also removes label flicker.
+    def __init__(self, emotion_detector, face_detector, reclassify_every=5,
+                 change_threshold=18.0, alpha=0.4, iou_threshold=0.3, max_missed=5):
+        self.emotion_detector = emotion_detector
+        self.face_detector = face_detector
+        self.reclassify_every = reclassify_every
+        self.change_threshold = change_threshold
+        self.alpha = alpha
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+        self.tracks = []
+        self.ids = itertools.count(1)
+
+    def _match(self, boxes):
+        pairs = sorted(((iou(track.box, box), t, b)
+                        for t, track in enumerate(self.tracks)
+                        for b, box in enumerate(boxes)), reverse=True)
+        matched_tracks, matched_boxes, matches = set(), set(), {}
+        for score, t, b in pairs:
+            if score < self.iou_threshold:
+                break
+            if t in matched_tracks or b in matched_boxes:
+                continue
+            matched_tracks.add(t)
+            matched_boxes.add(b)
+            matches[b] = self.tracks[t]
+        return matches
+
+    def _thumb(self, gray, box):
+        x, y, w, h = box
+        crop = gray[max(0, y):y + h, max(0, x):x + w]
+        if crop.size == 0:
+            return None
+        return cv2.resize(crop, THUMB_SIZE, interpolation=cv2.INTER_AREA)
+
+    def _smooth(self, track, emotions):
+        if track.emotions is None:
+            track.emotions = dict(emotions)
+        else:
+            track.emotions = {name: self.alpha * score + (1 - self.alpha) * track.emotions.get(name, score)
+                              for name, score in emotions.items()}
+
+    def process(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        boxes = self.face_detector.detect(gray)
+        matches = self._match(boxes)
+
+        current = []
+        to_classify = []
+        for b, box in enumerate(boxes):
+            track = matches.get(b)
+            if track is None:
+                track = TrackedFace(next(self.ids), box)
+                self.tracks.append(track)
+            track.box = box
+            track.missed = 0
+            track.since_classified += 1
+            thumb = self._thumb(gray, box)
+            changed = (track.thumb is None or thumb is None or
+                       float(cv2.absdiff(thumb, track.thumb).mean()) > self.change_threshold)
+            if track.emotions is None or changed or track.since_classified >= self.reclassify_every:
+                to_classify.append((track, thumb))
+            current.append(track)
+
+        if to_classify:
+            rects = [track.box for track, _ in to_classify]
+            results = self.emotion_detector.detect_emotions(frame, face_rectangles=rects)
+            for track, thumb in to_classify:
+                best = max(results, key=lambda r: iou(tuple(r["box"]), track.box), default=None)
+                if best is None or iou(tuple(best["box"]), track.box) < self.iou_threshold:
+                    continue
+                self._smooth(track, best["emotions"])
+                track.thumb = thumb
+                track.since_classified = 0
+
+        for track in self.tracks:
+            if track not in current:
+                track.missed += 1
+        self.tracks = [track for track in self.tracks if track.missed <= self.max_missed]
+
+        return [{"id": track.id, "box": list(track.box), "emotions": track.emotions}
+                for track in current if track.emotions is not None]
@@ -0,0 +1,337 @@
+import collections
+import queue
+import threading
+import time
+
+
+class FramePacket:
+    def __init__(self, index, frame, source=None):
+        self.index = index
+        self.frame = frame
+        self.source = source
+        self.timestamp = time.perf_counter()
+        self.detections = None
+
+
+class DropQueue:
+    # Bounded queue that never blocks the producer: when full, the oldest
+    # item is discarded so consumers always see the freshest frame.
+    def __init__(self, maxsize=1):
+        self.maxsize = maxsize
+        self.items = collections.deque()
+        self.cond = threading.Condition()
+        self.dropped = 0
+        self.closed = False
+
+    def put(self, item):
+        with self.cond:
+            if len(self.items) >= self.maxsize:
+                self.items.popleft()
+                self.dropped += 1
+            self.items.append(item)
+            self.cond.notify()
+
+    def get(self, timeout=None):
+        with self.cond:
+            if not self.cond.wait_for(lambda: self.items or self.closed, timeout):
+                raise queue.Empty
+            if not self.items:
+                raise queue.Empty
+            return self.items.popleft()
+
+    def get_nowait(self):
+        with self.cond:
+            if not self.items:
+                raise queue.Empty
+            return self.items.popleft()
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+    def __len__(self):
+        with self.cond:
+            return len(self.items)
+
+
+class FPSCounter:
+    # Measures real throughput: frames completed per second over a sliding
+    # window.
+    def __init__(self, window=2.0):
+        self.window = window
+        self.stamps = collections.deque()
+        self.start_time = None
+        self.lock = threading.Lock()
+
+    def tick(self):
+        now = time.perf_counter()
+        with self.lock:
+            if self.start_time is None:
+                self.start_time = now
+            self.stamps.append(now)
+            self._prune(now)
+
+    def _prune(self, now):
+        while self.stamps and now - self.stamps[0] > self.window:
+            self.stamps.popleft()
+
+    @property
+    def fps(self):
+        now = time.perf_counter()
+        with self.lock:
+            if self.start_time is None:
+                return 0.0
+            self._prune(now)
+            span = min(self.window, now - self.start_time)
+            return len(self.stamps) / span if span > 0 else 0.0
+
+
+class CaptureThread(threading.Thread):
+    def __init__(self, cap, out_queue, source=None):
+        super().__init__(name=f"capture-{source}", daemon=True)
+        self.cap = cap
+        self.out_queue = out_queue
+        self.source = source
+        self.stop_event = threading.Event()
+        self.failed = False
+        self.frames_read = 0
+
+    def run(self):
+        while not self.stop_event.is_set():
+            ret, frame = self.cap.read()
+            if not ret:
+                self.failed = True
+                break
+            self.out_queue.put(FramePacket(self.frames_read, frame, self.source))
+            self.frames_read += 1
+        self.out_queue.close()
+
+    def stop(self):
+        self.stop_event.set()
+
+
+class BatchCollector:
+    # Groups queued items into batches of up to batch_size, waiting at most
+    # max_wait seconds after the first item so a quiet source cannot stall
+    # the batch. A None item marks the end of the stream.
+    def __init__(self, in_queue, batch_size=4, max_wait=0.02):
+        self.in_queue = in_queue
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max_wait
+        self.exhausted = False
+
+    def next_batch(self, timeout=None):
+        if self.exhausted:
+            return []
+        first = self.in_queue.get(timeout=timeout)
+        if first is None:
+            self.exhausted = True
+            return []
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self.in_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self.exhausted = True
+                break
+            batch.append(item)
+        return batch
+
+
+class SourceStats:
+    def __init__(self):
+        self.captured = FPSCounter()
+        self.processed = FPSCounter()
+        self.dropped = 0
+
+
+class SourceInput:
+    # Queue-like handle a CaptureThread writes into
+    def __init__(self, scheduler, source):
+        self.scheduler = scheduler
+        self.source = source
+
+    def put(self, packet):
+        self.scheduler.put(self.source, packet)
+
+    def close(self):
+        self.scheduler.close(self.source)
+
+
+class FairScheduler:
+    # Fan-in of several sources into one consumer. Each source keeps only its
+    # newest `depth` frames, and a batch takes at most one frame per source,
+    # round-robin from where the previous batch stopped, so a fast camera
+    # cannot starve a slow one.
+    def __init__(self, sources, depth=1):
+        self.order = list(sources)
+        self.depth = depth
+        self.pending = {s: collections.deque() for s in self.order}
+        self.stats = {s: SourceStats() for s in self.order}
+        self.closed = set()
+        self.next_index = 0
+        self.cond = threading.Condition()
+
+    def input(self, source):
+        return SourceInput(self, source)
+
+    def put(self, source, packet):
+        with self.cond:
+            pending = self.pending[source]
+            if len(pending) >= self.depth:
+                pending.popleft()
+                self.stats[source].dropped += 1
+            pending.append(packet)
+            self.stats[source].captured.tick()
+            self.cond.notify()
+
+    def close(self, source):
+        with self.cond:
+            self.closed.add(source)
+            self.cond.notify_all()
+
+    def _has_pending(self):
+        return any(self.pending.values())
+
+    def next_batch(self, max_items=None, timeout=None):
+        max_items = max_items or len(self.order)
+        with self.cond:
+            if not self.cond.wait_for(
+                    lambda: self._has_pending() or len(self.closed) == len(self.order), timeout):
+                raise queue.Empty
+            batch = []
+            count = len(self.order)
+            for step in range(count):
+                source = self.order[(self.next_index + step) % count]
+                if self.pending[source]:
+                    batch.append(self.pending[source].popleft())
+                    if len(batch) >= max_items:
+                        break
+            self.next_index = (self.next_index + step + 1) % count
+            if not batch:
+                raise queue.Empty
+            return batch
+
+    @property
+    def finished(self):
+        with self.cond:
+            return len(self.closed) == len(self.order) and not self._has_pending()
+
+
+class DetectionPipeline:
+    # One capture thread per source -> fair scheduler -> a single inference
+    # worker sharing one model -> latest result per source for the consumer
+    # (e.g. the Tk render loop). Stale frames are dropped at every hand-off
+    # instead of building up latency.
+    def __init__(self, caps, process_batch, batch_size=None, pool=None, overlay=None,
+                 render_size=None):
+        self.scheduler = FairScheduler(list(caps))
+        self.captures = [CaptureThread(cap, self.scheduler.input(source), source)
+                         for source, cap in caps.items()]
+        self.process_batch = process_batch
+        self.batch_size = batch_size or len(caps)
+        self.pool = pool
+        self.overlay = overlay
+        self.render_size = render_size
+        self.latest = {}
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        work = self._work_pool if pool else self._work
+        self.worker = threading.Thread(target=work, name="inference", daemon=True)
+        self.worker_done = False
+        self.fps = FPSCounter()
+
+    @property
+    def stats(self):
+        return self.scheduler.stats
+
+    def start(self):
+        for capture in self.captures:
+            capture.start()
+        self.worker.start()
+
+    def stop(self, timeout=1.0):
+        self.stop_event.set()
+        for capture in self.captures:
+            capture.stop()
+        for capture in self.captures:
+            capture.join(timeout)
+        self.worker.join(timeout)
+
+    def _work(self):
+        while not self.stop_event.is_set():
+            try:
+                batch = self.scheduler.next_batch(self.batch_size, timeout=0.1)
+            except queue.Empty:
+                if self.scheduler.finished:
+                    break
+                continue
+            try:
+                packets = self.process_batch(batch)
+            except Exception as e:
+                print(f"⚠️ inference error: {e}")
+                continue
+            self._publish(packets)
+        self.worker_done = True
+
+    def _work_pool(self):
+        # Keeps every pool slot busy so frames are processed on several cores
+        # at once; results still come back in capture order.
+        while not self.stop_event.is_set():
+            while self.pool.has_capacity():
+                wait = 0 if self.pool.in_flight else 0.1
+                try:
+                    batch = self.scheduler.next_batch(1, timeout=wait)
+                except queue.Empty:
+                    break
+                packet = batch[0]
+                overlay = self.overlay(packet) if self.overlay else None
+                self.pool.submit(packet.frame, packet, overlay, self.render_size)
+            if not self.pool.in_flight:
+                if self.scheduler.finished:
+                    break
+                continue
+            try:
+                results = self.pool.collect(timeout=0.01)
+            except RuntimeError as e:
+                print(f"❌ {e}")
+                break
+            packets = []
+            for packet, detections, frame in results:
+                if packet.source not in self.stats:
+                    continue
+                if isinstance(detections, Exception):
+                    print(f"⚠️ inference error: {detections}")
+                    continue
+                packet.detections = detections
+                packet.frame = frame
+                packets.append(packet)
+            self._publish(packets)
+        self.worker_done = True
+
+    def _publish(self, packets):
+        with self.lock:
+            for packet in packets:
+                if packet.source in self.latest:
+                    self.stats[packet.source].dropped += 1
+                self.latest[packet.source] = packet
+
+    def poll(self):
+        with self.lock:
+            packets, self.latest = self.latest, {}
+        for packet in packets.values():
+            self.stats[packet.source].processed.tick()
+            self.fps.tick()
+        return packets
+
+    @property
+    def finished(self):
+        with self.lock:
+            return self.worker_done and not self.latest
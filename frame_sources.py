@@ -0,0 +1,96 @@
+import glob
+import os
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+
+# All sources expose the cv2.VideoCapture subset the pipeline relies on:
+# read() -> (ret, frame), isOpened() and release().
+
+
+class VideoSource:
+    def __init__(self, target):
+        self.cap = cv2.VideoCapture(target)
+        self.name = str(target)
+
+    def read(self):
+        return self.cap.read()
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageGlobSource:
+    def __init__(self, pattern):
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, '*')
+        self.paths = sorted(p for p in glob.glob(pattern)
+                            if p.lower().endswith(IMAGE_EXTENSIONS))
+        self.position = 0
+        self.name = pattern
+
+    def read(self):
+        while self.position < len(self.paths):
+            frame = cv2.imread(self.paths[self.position])
+            self.position += 1
+            if frame is not None:
+                return True, frame
+            print(f"⚠️ Skipping unreadable image: {self.paths[self.position - 1]}")
+        return False, None
+
+    def isOpened(self):
+        return len(self.paths) > 0
+
+    def release(self):
+        self.position = len(self.paths)
+
+
+class SyntheticSource:
+    # Moving colored rectangles on a noisy background, for benchmarking
+    # without a camera or any recorded footage.
+    def __init__(self, width=640, height=480, count=None, seed=0):
+        self.width = width
+        self.height = height
+        self.count = count
+        self.produced = 0
+        self.rng = np.random.default_rng(seed)
+        self.background = self.rng.integers(0, 64, (height, width, 3), dtype=np.uint8)
+        self.name = f"synthetic:{width}x{height}"
+
+    def read(self):
+        if self.count is not None and self.produced >= self.count:
+            return False, None
+        frame = self.background.copy()
+        t = self.produced
+        for i, color in enumerate([(0, 200, 255), (255, 128, 0), (60, 220, 60)]):
+            x = (t * (4 + i * 3) + i * 150) % max(1, self.width - 120)
+            y = (i * 130 + t * (i + 1)) % max(1, self.height - 100)
+            cv2.rectangle(frame, (x, y), (x + 120, y + 100), color, -1)
+        self.produced += 1
+        return True, frame
+
+    def isOpened(self):
+        return True
+
+    def release(self):
+        self.count = self.produced
+
+
+def open_source(spec, max_frames=None):
+    # "synthetic" / "synthetic:WxH", a camera index, an image directory or
+    # glob, or anything cv2.VideoCapture understands (files, URLs).
+    spec = str(spec)
+    if spec.startswith("synthetic"):
+        width, height = 640, 480
+        if ":" in spec:
+            width, height = (int(v) for v in spec.split(":", 1)[1].lower().split("x"))
+        return SyntheticSource(width, height, count=max_frames)
+    if spec.isdigit():
+        return VideoSource(int(spec))
+    if os.path.isdir(spec) or any(c in spec for c in "*?["):
+        return ImageGlobSource(spec)
+    return VideoSource(spec)
@@ -0,0 +1,75 @@
+import re
+
+TOKEN = re.compile(r"[a-z0-9']+")
+
+
+def tokenize(text):
+    return TOKEN.findall(text.lower())
+
+
+class Intent:
+    def __init__(self, name, phrases, handler, priority, order):
+        self.name = name
+        self.phrases = phrases
+        self.handler = handler
+        self.priority = priority
+        self.order = order
+
+
+class IntentRouter:
+    # Intents register keyword phrases ("hi", "see you", "your name"); they
+    # are compiled into one index keyed by each phrase's rarest token, so
+    # routing costs one dict lookup per word of the utterance and buckets
+    # stay small however many intents exist. Phrases match whole words
+    # only. When several intents match, the highest priority wins, then the
+    # one registered first.
+    def __init__(self, fallback=None):
+        self.intents = []
+        self.fallback = fallback
+        self.index = None
+
+    def register(self, name, phrases, handler, priority=0):
+        if isinstance(phrases, str):
+            phrases = [phrases]
+        tokens = [tuple(tokenize(phrase)) for phrase in phrases]
+        if not all(tokens):
+            raise RuntimeError(f"Intent {name} has an empty phrase")
+        self.intents.append(Intent(name, tokens, handler, priority, len(self.intents)))
+        self.index = None
+
+    def compile(self):
+        counts = {}
+        for intent in self.intents:
+            for phrase in intent.phrases:
+                for token in phrase:
+                    counts[token] = counts.get(token, 0) + 1
+        index = {}
+        for intent in self.intents:
+            for phrase in intent.phrases:
+                anchor = min(range(len(phrase)), key=lambda k: counts[phrase[k]])
+                index.setdefault(phrase[anchor], []).append((phrase, anchor, intent))
+        # Within one bucket, try stronger intents first
+        for candidates in index.values():
+            candidates.sort(key=lambda c: (-c[2].priority, c[2].order))
+        self.index = index
+
+    def match(self, text):
+        if self.index is None:
+            self.compile()
+        tokens = tokenize(text)
+        best = None
+        for i, token in enumerate(tokens):
+            for phrase, anchor, intent in self.index.get(token, ()):
+                if best is not None and (intent.priority, -intent.order) <= (best.priority, -best.order):
+                    break
+                start = i - anchor
+                if start >= 0 and tuple(tokens[start:start + len(phrase)]) == phrase:
+                    best = intent
+                    break
+        return best
+
+    def route(self, text):
+        intent = self.match(text)
+        if intent is None:
+            return self.fallback(text) if self.fallback else None
+        return intent.handler(text)
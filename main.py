@@ -3,15 +3,29 @@ from tkinter import messagebox
 import subprocess
 import sys
 import os
+from model_server import connect_model_server, ensure_auth_key
+from supervisor import ToolSupervisor
 
 class AIToolsLauncher:
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("NeuroTask: MultiAI")
-        self.root.geometry("600x700")
+        self.root.geometry("600x800")
         self.root.configure(bg='#0f172a')
         self.root.resizable(False, False)
+        self.server_process = None
+        self.broker_process = None
+        self.client = None
+        self.launches = {}
+        self.usage_labels = {}
+        self.supervisor = ToolSupervisor()
+        # Random per-launcher secret for the model server and camera broker
+        # sockets, inherited by everything started from here
+        ensure_auth_key()
+        self.start_model_server()
+        self.start_camera_broker()
         self.setup_gui()
+        self.root.after(1000, self.monitor)
     
     def setup_gui(self):
         header = tk.Frame(self.root, bg='#1e40af', height=100)
@@ -31,13 +45,13 @@ class AIToolsLauncher:
         
         tools = [
             {'name': '🎤 Voice Assistant', 'desc': 'Speech recognition and text-to-speech', 
-             'file': 'voice_assistant.py', 'color': '#3b82f6'},
+             'file': 'voice_assistant.py', 'color': '#3b82f6', 'camera': False},
             {'name': '📷 Object Detection', 'desc': 'Real-time object detection', 
-             'file': 'object_detection.py', 'color': '#10b981'},
+             'file': 'object_detection.py', 'color': '#10b981', 'camera': True},
             {'name': '😊 Emotion Detection', 'desc': 'Face emotion recognition', 
-             'file': 'emotion_detection.py', 'color': '#f59e0b'},
+             'file': 'emotion_detection.py', 'color': '#f59e0b', 'camera': True},
             {'name': '✅ To-Do List', 'desc': 'Smart task manager', 
-             'file': 'todo_list.py', 'color': '#8b5cf6'}
+             'file': 'todo_list.py', 'color': '#8b5cf6', 'camera': False}
         ]
         
         for tool in tools:
@@ -47,9 +61,29 @@ class AIToolsLauncher:
         footer.pack(fill='x', side='bottom')
         footer.pack_propagate(False)
         
-        tk.Label(footer, text="💡 You can run multiple tools simultaneously",
-                font=('Helvetica', 10),
-                bg='#1e293b', fg='#94a3b8').pack(pady=20)
+        self.latency_label = tk.Label(footer, text="💡 You can run multiple tools simultaneously",
+                                      font=('Helvetica', 10),
+                                      bg='#1e293b', fg='#94a3b8')
+        self.latency_label.pack(pady=20)
+    
+    def start_model_server(self):
+        # One warm process holds the models; tools attach to it instead of
+        # loading their own copies on every launch
+        self.client = connect_model_server()
+        if self.client:
+            return
+        try:
+            self.server_process = subprocess.Popen([sys.executable, 'model_server.py'])
+        except Exception as e:
+            print(f"❌ Could not start model server: {e}")
+    
+    def start_camera_broker(self):
+        # Owns the cameras so several tools can read one device; exits on its
+        # own if another launcher already started one
+        try:
+            self.broker_process = subprocess.Popen([sys.executable, 'camera_broker.py'])
+        except Exception as e:
+            print(f"❌ Could not start camera broker: {e}")
     
     def create_tool_button(self, parent, tool):
         frame = tk.Frame(parent, bg='#1e293b', relief='raised', bd=2)
@@ -69,24 +103,82 @@ class AIToolsLauncher:
                 font=('Helvetica', 10),
                 bg='#1e293b', fg='#94a3b8', anchor='w').pack(fill='x', pady=(5, 0))
         
+        usage = tk.Label(content, text="○ Not running",
+                        font=('Helvetica', 9),
+                        bg='#1e293b', fg='#64748b', anchor='w')
+        usage.pack(fill='x', pady=(5, 0))
+        self.usage_labels[tool['file']] = usage
+        
         btn = tk.Button(frame, text="Launch ▶️",
-                       command=lambda f=tool['file']: self.launch_tool(f),
+                       command=lambda t=tool: self.launch_tool(t['file'], t['camera']),
                        bg=tool['color'], fg='white',
                        font=('Helvetica', 11, 'bold'),
                        relief='flat', padx=20, pady=10, cursor='hand2')
         btn.pack(side='right', padx=15)
     
-    def launch_tool(self, filename):
+    def launch_tool(self, filename, camera=False):
         if not os.path.exists(filename):
             messagebox.showerror("File Not Found", f"Could not find {filename}")
             return
         try:
-            subprocess.Popen([sys.executable, filename])
+            tool = self.supervisor.launch(filename, camera=camera)
+            self.launches[tool.launch_id] = filename
+            self.latency_label.config(text=f"🚀 Launching {filename}...")
             messagebox.showinfo("Success", f"Launched {filename}!")
+        except RuntimeError as e:
+            messagebox.showwarning("Not Launched", str(e))
         except Exception as e:
             messagebox.showerror("Error", f"Failed to launch: {str(e)}")
     
+    def monitor(self):
+        for filename, event in self.supervisor.poll():
+            if event == 'restarted':
+                tool = self.supervisor.tools[filename]
+                self.launches[tool.launch_id] = filename
+                self.latency_label.config(text=f"🔁 {filename} crashed and was restarted")
+            elif event == 'crashed':
+                self.latency_label.config(text=f"❌ {filename} keeps crashing, not restarting")
+        
+        reported_times, reported_stats = {}, {}
+        if not self.client:
+            self.client = connect_model_server()
+        if self.client:
+            try:
+                reported_times = self.client.call('launch_times')
+                reported_stats = self.client.call('tool_stats')
+            except Exception:
+                self.client = None
+        for launch_id, (tool, latency) in reported_times.items():
+            if self.launches.pop(launch_id, None):
+                self.latency_label.config(text=f"⏱️ {tool} ready in {latency:.2f}s")
+        
+        for filename, label in self.usage_labels.items():
+            tool = self.supervisor.tools.get(filename)
+            if not tool or not tool.running:
+                label.config(text="○ Not running", fg='#64748b')
+                continue
+            parts = ["● Running"]
+            if tool.cpu_percent is not None:
+                parts.append(f"CPU {tool.cpu_percent:.0f}%")
+            if tool.rss is not None:
+                parts.append(f"RSS {tool.rss / 1e6:.0f} MB")
+            fps = reported_stats.get(tool.launch_id, {}).get('fps')
+            if fps is not None:
+                parts.append(f"FPS {fps:.1f}")
+            label.config(text="   ".join(parts), fg='#10b981')
+        
+        self.root.after(1000, self.monitor)
+    
     def run(self):
+        def on_close():
+            self.supervisor.shutdown()
+            if self.server_process:
+                self.server_process.terminate()
+            if self.broker_process:
+                self.broker_process.terminate()
+            self.root.destroy()
+        
+        self.root.protocol("WM_DELETE_WINDOW", on_close)
         self.root.mainloop()
 
 if __name__ == "__main__":
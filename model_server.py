@@ -0,0 +1,311 @@
+import os
+import secrets
+import sys
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+
+HOST = '127.0.0.1'
+PORT = int(os.environ.get('NEUROTASK_MODEL_PORT', '6101'))
+AUTHKEY_ENV = 'NEUROTASK_MODEL_KEY'
+
+LAUNCH_ID_ENV = 'NEUROTASK_LAUNCH_ID'
+LAUNCH_T0_ENV = 'NEUROTASK_LAUNCH_T0'
+BENCHMARK_ENV = 'NEUROTASK_STARTUP_BENCHMARK'
+
+
+def auth_key():
+    # Shared secret for the local sockets. multiprocessing.connection unpickles
+    # whatever an authenticated peer sends, so there is deliberately no
+    # default: the launcher generates a random key and passes it to the
+    # server and every tool through the environment.
+    key = os.environ.get(AUTHKEY_ENV)
+    return key.encode() if key else None
+
+
+def ensure_auth_key():
+    if not os.environ.get(AUTHKEY_ENV):
+        os.environ[AUTHKEY_ENV] = secrets.token_hex(32)
+    return auth_key()
+
+
+class ModelServer:
+    # Long-lived process that loads the SSD MobileNet model, FER and the TTS
+    # engine once. Tools connect over a local authenticated socket instead of
+    # loading their own copies. Models load in the background so the server
+    # answers pings (and launch-time reports) right away.
+    def __init__(self, host=HOST, port=PORT):
+        key = auth_key()
+        if key is None:
+            raise RuntimeError(f"{AUTHKEY_ENV} is not set; start the server from main.py "
+                               f"or set it to a random secret")
+        self.listener = Listener((host, port), authkey=key)
+        self.loaded = threading.Event()
+        self.object_detector = None
+        self.emotion_detector = None
+        self.tts = None
+        self.object_lock = threading.Lock()
+        self.emotion_lock = threading.Lock()
+        self.launch_times = {}
+        self.tool_stats = {}
+        self.load_times = {}
+
+    def preload(self):
+        # TTS first: it takes well under a second, and the voice assistant
+        # needs nothing else, so it shouldn't wait for TensorFlow
+        try:
+            from tts_worker import TTSWorker
+            tts = TTSWorker(rate=150)
+            tts.ready.wait()
+            if tts.error:
+                raise tts.error
+            self.tts = tts
+        except Exception as e:
+            print(f"❌ TTS not available: {e}")
+
+        start = time.perf_counter()
+        try:
+            from detector import FILES_EXIST, ObjectDetector
+            if FILES_EXIST:
+                self.object_detector = ObjectDetector()
+                self.load_times['ssd'] = time.perf_counter() - start
+                print(f"✅ SSD MobileNet loaded in {self.load_times['ssd']:.2f}s")
+        except Exception as e:
+            print(f"❌ SSD MobileNet not available: {e}")
+
+        start = time.perf_counter()
+        try:
+            from fer import FER
+            from emotion_classifier import BatchEmotionClassifier
+            from face_detector import get_face_detector
+            self.emotion_detector = BatchEmotionClassifier(FER(mtcnn=False), get_face_detector())
+            self.load_times['fer'] = time.perf_counter() - start
+            print(f"✅ FER loaded in {self.load_times['fer']:.2f}s")
+        except Exception as e:
+            print(f"❌ FER not available: {e}")
+        self.loaded.set()
+
+    def handle(self, op, args):
+        if op == 'ping':
+            return 'pong'
+        if op == 'ready':
+            launch_id, tool, latency = args
+            self.launch_times[launch_id] = (tool, latency)
+            return True
+        if op == 'launch_times':
+            return dict(self.launch_times)
+        if op == 'report_stats':
+            launch_id, stats = args
+            self.tool_stats[launch_id] = stats
+            return True
+        if op == 'tool_stats':
+            return dict(self.tool_stats)
+        if op == 'speaking':
+            # Polled by the voice assistant's VAD, so it must not wait for loading
+            return self.tts is not None and self.tts.playing()
+        if op == 'status':
+            return {'loaded': self.loaded.is_set(),
+                    'ssd': self.object_detector is not None,
+                    'fer': self.emotion_detector is not None,
+                    'tts': self.tts is not None,
+                    'load_times': dict(self.load_times)}
+
+        self.loaded.wait()
+        if op == 'capabilities':
+            return self.handle('status', ())
+        if op == 'class_names':
+            return self.require(self.object_detector, 'SSD MobileNet').classNames
+        if op == 'detect_objects':
+            detector = self.require(self.object_detector, 'SSD MobileNet')
+            with self.object_lock:
+                return detector.detect_batch(args[0])
+        if op == 'detect_emotions':
+            detector = self.require(self.emotion_detector, 'FER')
+            frame, rects = args
+            with self.emotion_lock:
+                return detector.detect_emotions(frame, face_rectangles=rects)
+        if op == 'speak':
+            text, cacheable = args if len(args) == 2 else (args[0], False)
+            self.require(self.tts, 'TTS').say(text, cacheable=cacheable)
+            return True
+        if op == 'interrupt':
+            self.require(self.tts, 'TTS').interrupt()
+            return True
+        if op == 'prerender':
+            self.require(self.tts, 'TTS').prerender(args[0])
+            return True
+        raise ValueError(f"Unknown request: {op}")
+
+    def require(self, model, name):
+        if model is None:
+            raise RuntimeError(f"{name} is not loaded on the model server")
+        return model
+
+    def serve_connection(self, conn):
+        with conn:
+            while True:
+                try:
+                    op, args = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    conn.send(('ok', self.handle(op, args)))
+                except Exception as e:
+                    conn.send(('error', str(e)))
+
+    def serve_forever(self):
+        threading.Thread(target=self.preload, daemon=True).start()
+        print(f"🟢 Model server listening on {self.listener.address}")
+        while True:
+            try:
+                conn = self.listener.accept()
+            except Exception as e:
+                print(f"⚠️ Rejected connection: {e}")
+                continue
+            threading.Thread(target=self.serve_connection, args=(conn,), daemon=True).start()
+
+
+class ModelClient:
+    def __init__(self, conn):
+        self.conn = conn
+        self.lock = threading.Lock()
+
+    def call(self, op, *args):
+        with self.lock:
+            self.conn.send((op, args))
+            status, result = self.conn.recv()
+        if status == 'error':
+            raise RuntimeError(result)
+        return result
+
+    def close(self):
+        self.conn.close()
+
+
+def connect_model_server(host=HOST, port=PORT):
+    key = auth_key()
+    if key is None:
+        return None
+    try:
+        client = ModelClient(Client((host, port), authkey=key))
+        client.call('ping')
+        return client
+    except Exception:
+        return None
+
+
+def server_has(client, model, timeout):
+    # Whether the server has `model` ('ssd', 'fer' or 'tts') loaded. Polls
+    # 'status', which answers right away, where 'capabilities' would wait for
+    # every model; gives up (False) if it is still loading after `timeout`.
+    deadline = time.monotonic() + timeout
+    status = client.call('status')
+    while not status[model] and not status['loaded'] and time.monotonic() < deadline:
+        time.sleep(0.1)
+        status = client.call('status')
+    return status[model]
+
+
+class RemoteObjectDetector:
+    # Same interface as detector.ObjectDetector, backed by the model server
+    def __init__(self, client):
+        self.client = client
+        self.classNames = client.call('class_names')
+
+    def detect(self, frame):
+        return self.detect_batch([frame])[0]
+
+    def detect_batch(self, frames):
+        return self.client.call('detect_objects', list(frames))
+
+    def class_name(self, class_id):
+        if 0 < class_id <= len(self.classNames):
+            return self.classNames[class_id - 1]
+        return str(class_id)
+
+
+class RemoteEmotionDetector:
+    # Same detect_emotions() interface as FER, backed by the model server
+    def __init__(self, client):
+        self.client = client
+
+    def detect_emotions(self, frame, face_rectangles=None):
+        return self.client.call('detect_emotions', frame, face_rectangles)
+
+
+def benchmark_mode():
+    return os.environ.get(BENCHMARK_ENV) == '1'
+
+
+def launch_elapsed():
+    t0 = os.environ.get(LAUNCH_T0_ENV)
+    return time.time() - float(t0) if t0 else None
+
+
+def report_milestone(tool, milestone):
+    # Startup milestones relative to the launch time set by the launcher or
+    # by benchmark_startup.py; printed in a parseable form when benchmarking.
+    elapsed = launch_elapsed()
+    if elapsed is None:
+        return None
+    print(f"⏱️ {tool} {milestone.replace('_', ' ')} {elapsed:.2f}s after launch")
+    if benchmark_mode():
+        print(f"BENCHMARK {tool} {milestone} {elapsed:.4f}", flush=True)
+    return elapsed
+
+
+def report_ready(tool):
+    # Called by a tool once its window is up; the launcher reads the latency
+    # back from the server.
+    latency = report_milestone(tool, 'first_window')
+    launch_id = os.environ.get(LAUNCH_ID_ENV)
+    if latency is None or not launch_id:
+        return latency
+    client = connect_model_server()
+    if client:
+        try:
+            client.call('ready', launch_id, tool, latency)
+        finally:
+            client.close()
+    return latency
+
+
+def report_first_inference(tool):
+    return report_milestone(tool, 'first_inference')
+
+
+class StatsReporter:
+    # Lets a tool publish live numbers (e.g. FPS) for the launcher's
+    # supervisor; sends at most once per interval and is a no-op when the
+    # tool was not started by the launcher or no server is running.
+    def __init__(self, interval=1.0):
+        self.launch_id = os.environ.get(LAUNCH_ID_ENV)
+        self.interval = interval
+        self.last_sent = 0.0
+        self.client = None
+
+    def report(self, **stats):
+        now = time.monotonic()
+        if not self.launch_id or now - self.last_sent < self.interval:
+            return
+        self.last_sent = now
+        if self.client is None:
+            self.client = connect_model_server()
+            if self.client is None:
+                return
+        try:
+            self.client.call('report_stats', self.launch_id, stats)
+        except Exception:
+            self.client = None
+
+
+if __name__ == "__main__":
+    try:
+        server = ModelServer()
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    except OSError as e:
+        print(f"❌ Model server already running or port busy: {e}")
+        sys.exit(1)
+    server.serve_forever()
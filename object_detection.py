@@ -1,39 +1,97 @@
+import argparse
+import math
+import threading
 import cv2
+import numpy as np
 import tkinter as tk
 from tkinter import messagebox
 from PIL import Image, ImageTk
-import os
-import time
+from adaptive_detection import AdaptiveDetector
+from camera_broker import open_shared_camera
+from detector import FILES_EXIST, BatchObjectDetector, draw_detections
+from frame_pipeline import DetectionPipeline
+from frame_sources import open_source
+from model_server import (RemoteObjectDetector, StatsReporter, benchmark_mode,
+                          connect_model_server, report_first_inference, report_ready)
+from process_pool import ProcessDetectorPool
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-classFile = os.path.join(BASE_DIR, "coco.names")
-configPath = os.path.join(BASE_DIR, "ssd_mobilenet_v3_large_coco_2020_01_14.pbtxt")
-weightsPath = os.path.join(BASE_DIR, "frozen_inference_graph.pb")
-
-FILES_EXIST = all(os.path.exists(f) for f in [classFile, configPath, weightsPath])
+DISPLAY_SIZE = (640, 480)
 
 class ObjectDetection:
-    def __init__(self):
+    def __init__(self, workers=0, adaptive=False, target_fps=None):
         self.root = tk.Tk()
         self.root.title("📷 Object Detection")
         self.root.geometry("900x750")
         self.root.configure(bg='#0f172a')
         
         self.is_running = False
-        self.last_time = time.time()
-        self.cap = None
+        self.caps = {}
+        self.pipeline = None
+        self.tiles = {}
+        self.tile_size = DISPLAY_SIZE
+        self.grid = (1, 1)
         
-        if FILES_EXIST:
-            with open(classFile, "r") as f:
-                self.classNames = f.read().strip().split("\n")
-            
-            self.net = cv2.dnn_DetectionModel(weightsPath, configPath)
-            self.net.setInputSize(320, 320)
-            self.net.setInputScale(1 / 127.5)
-            self.net.setInputMean((127.5, 127.5, 127.5))
-            self.net.setInputSwapRB(True)
+        # One model instance is shared by every source, unless detection is
+        # handed to a pool of worker processes that each load their own
+        self.workers = workers
+        self.adaptive = adaptive
+        self.target_fps = target_fps
+        self.pool = None
+        self.client = None
+        self.detector = None
+        self.models_loaded = threading.Event()
+        self.stats_reporter = StatsReporter()
         
+        # Show the window first and load the model in the background
         self.setup_gui()
+        if FILES_EXIST:
+            threading.Thread(target=self.load_models, daemon=True).start()
+        else:
+            self.models_loaded.set()
+        self.root.after(50, self.check_models)
+    
+    def load_models(self):
+        try:
+            if self.workers:
+                self.pool = ProcessDetectorPool(workers=self.workers)
+            else:
+                self.detector = self.attach_detector()
+                # Warm-up pass: the first forward pass allocates the network
+                self.detector.detect(np.zeros((DISPLAY_SIZE[1], DISPLAY_SIZE[0], 3), dtype=np.uint8))
+                report_first_inference("object_detection.py")
+                if self.adaptive:
+                    self.detector = AdaptiveDetector(self.detector, target_fps=self.target_fps)
+        except Exception as e:
+            print(f"❌ Failed to load model: {e}")
+        self.models_loaded.set()
+    
+    def check_models(self):
+        if not self.models_loaded.is_set():
+            self.root.after(50, self.check_models)
+            return
+        if self.detector or self.pool:
+            self.status_label.config(text="Status: Idle", fg='white')
+            self.start_btn.config(state='normal')
+        elif FILES_EXIST:
+            self.status_label.config(text="Status: Model failed to load ❌", fg='#ef4444')
+        else:
+            self.status_label.config(text="Status: Idle", fg='white')
+        if benchmark_mode():
+            self.root.destroy()
+    
+    def attach_detector(self):
+        # Prefer the already-warm model in the model server over loading a copy
+        self.client = connect_model_server()
+        if self.client:
+            try:
+                detector = RemoteObjectDetector(self.client)
+                print("✅ Using the shared model server")
+                return detector
+            except RuntimeError as e:
+                print(f"⚠️ Model server can't detect objects: {e}")
+                self.client.close()
+                self.client = None
+        return BatchObjectDetector()
     
     def setup_gui(self):
         header = tk.Frame(self.root, bg='#10b981', height=80)
@@ -51,7 +109,7 @@ class ObjectDetection:
         self.video_label = tk.Label(container, bg='black')
         self.video_label.pack(padx=20, pady=20)
         
-        self.status_label = tk.Label(container, text="Status: Idle", 
+        self.status_label = tk.Label(container, text="Status: Loading model... ⏳", 
                                      font=('Helvetica', 12, 'bold'), bg='#1e293b', fg='white')
         self.status_label.pack(pady=10)
         
@@ -60,7 +118,7 @@ class ObjectDetection:
         
         self.start_btn = tk.Button(btn_frame, text="▶️ Start Detection", command=self.start_detection,
                                    bg='#10b981', fg='white', font=('Helvetica', 13, 'bold'),
-                                   relief='flat', padx=30, pady=12, cursor='hand2')
+                                   relief='flat', padx=30, pady=12, cursor='hand2', state='disabled')
         self.start_btn.pack(side='left', padx=10)
         
         self.stop_btn = tk.Button(btn_frame, text="⏹️ Stop Detection", command=self.stop_detection,
@@ -71,16 +129,16 @@ class ObjectDetection:
         camera_frame = tk.Frame(container, bg='#1e293b')
         camera_frame.pack(pady=5)
         
-        tk.Label(camera_frame, text="Camera:", font=('Helvetica', 10),
+        tk.Label(camera_frame, text="Sources:", font=('Helvetica', 10),
                 bg='#1e293b', fg='white').pack(side='left', padx=(0, 10))
         
         self.camera_var = tk.StringVar(value="0")
-        tk.Radiobutton(camera_frame, text="Camera 0", variable=self.camera_var, value="0",
-                      bg='#1e293b', fg='white', selectcolor='#334155',
-                      font=('Helvetica', 10)).pack(side='left', padx=5)
-        tk.Radiobutton(camera_frame, text="Camera 1", variable=self.camera_var, value="1",
-                      bg='#1e293b', fg='white', selectcolor='#334155',
-                      font=('Helvetica', 10)).pack(side='left', padx=5)
+        tk.Entry(camera_frame, textvariable=self.camera_var, width=30,
+                font=('Helvetica', 10), relief='flat', bg='#0f172a', fg='white',
+                insertbackground='white').pack(side='left', padx=5)
+        
+        tk.Label(camera_frame, text="(camera indices or files, comma separated)",
+                font=('Helvetica', 9), bg='#1e293b', fg='#94a3b8').pack(side='left', padx=5)
         
         footer = tk.Frame(self.root, bg='#0f172a')
         footer.pack(fill='x', side='bottom', pady=(0, 10))
@@ -98,88 +156,153 @@ class ObjectDetection:
             messagebox.showerror("Error", "Model files not found!")
             return
         
-        camera_index = int(self.camera_var.get())
+        specs = [spec.strip() for spec in self.camera_var.get().split(",") if spec.strip()]
+        if not specs:
+            messagebox.showerror("Error", "Enter at least one camera index or video file!")
+            return
         
         try:
-            self.cap = cv2.VideoCapture(camera_index, cv2.CAP_DSHOW)  # Windows optimization
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+            for spec in specs:
+                self.caps[spec] = self.open_capture(spec)
             
-            if not self.cap.isOpened():
-                raise RuntimeError(f"Camera {camera_index} not accessible")
-            
-            ret, test_frame = self.cap.read()
-            if not ret:
-                self.cap.release()
-                raise RuntimeError(f"Camera {camera_index} can't read frames")
+            cols = math.ceil(math.sqrt(len(specs)))
+            rows = math.ceil(len(specs) / cols)
+            self.tile_size = (DISPLAY_SIZE[0] // cols, DISPLAY_SIZE[1] // rows)
+            self.grid = (cols, rows)
+            self.tiles = {}
             
             self.is_running = True
             self.start_btn.config(state='disabled')
             self.stop_btn.config(state='normal')
             self.status_label.config(text="Status: Detection Running ✅", fg='#10b981')
-            self.last_time = time.time()
-            self.update()
+            self.pipeline = DetectionPipeline(self.caps, self.process_batch, pool=self.pool,
+                                              overlay=self.overlay_text, render_size=self.tile_size)
+            self.pipeline.start()
+            self.render()
             
         except Exception as e:
             messagebox.showerror("Camera Error", f"Failed to start camera:\n{str(e)}")
-            if self.cap:
-                self.cap.release()
+            self.shutdown_pipeline()
+    
+    def open_capture(self, spec):
+        # Cameras go through the broker when one is running so other tools
+        # can read the same device
+        cap = open_shared_camera(spec) if spec.isdigit() else None
+        if cap is None and spec.isdigit():
+            cap = cv2.VideoCapture(int(spec), cv2.CAP_DSHOW)  # Windows optimization
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        elif cap is None:
+            cap = open_source(spec)
+        
+        if not cap.isOpened():
+            cap.release()
+            raise RuntimeError(f"Source {spec} not accessible")
+        
+        ret, test_frame = cap.read()
+        if not ret:
+            cap.release()
+            raise RuntimeError(f"Source {spec} can't read frames")
+        return cap
     
     def stop_detection(self):
         self.is_running = False
-        if self.cap:
-            self.cap.release()
-            self.cap = None
+        self.shutdown_pipeline()
         self.start_btn.config(state='normal')
         self.stop_btn.config(state='disabled')
         self.status_label.config(text="Status: Stopped", fg='#ef4444')
         self.video_label.config(image='')
     
-    def update(self):
-        if not self.is_running or not self.cap:
-            return
-        
-        ret, frame = self.cap.read()
-        if not ret:
-            self.stop_detection()
-            return
-        
+    def shutdown_pipeline(self):
+        if self.pipeline:
+            self.pipeline.stop()
+            self.pipeline = None
+        for cap in self.caps.values():
+            cap.release()
+        self.caps = {}
+    
+    def process_batch(self, packets):
+        # Runs on the inference worker thread, never on the Tk thread
         try:
-            classIds, confs, boxes = self.net.detect(frame, confThreshold=0.5)
-            
-            if len(classIds) > 0:
-                for classId, confidence, box in zip(classIds.flatten(), confs.flatten(), boxes):
-                    label = f"{self.classNames[classId - 1]} {confidence:.2f}"
-                    cv2.rectangle(frame, box, (0, 255, 0), 2)
-                    cv2.putText(frame, label, (box[0], box[1] - 10),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+            frames = [packet.frame for packet in packets]
+            if isinstance(self.detector, AdaptiveDetector):
+                results = self.detector.detect_batch(frames, [packet.source for packet in packets])
+            else:
+                results = self.detector.detect_batch(frames)
         except Exception as e:
             print(f"Detection error: {e}")
+            results = [[] for _ in packets]
         
-        current_time = time.time()
-        fps = 1 / (current_time - self.last_time)
-        self.last_time = current_time
-        cv2.putText(frame, f"FPS: {int(fps)}", (10, 30),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
+        for packet, detections in zip(packets, results):
+            frame = draw_detections(packet.frame, detections, self.detector.class_name)
+            cv2.putText(frame, self.overlay_text(packet), (10, 30),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
+            frame = cv2.resize(frame, self.tile_size)
+            packet.frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        return packets
+    
+    def overlay_text(self, packet):
+        pipeline = self.pipeline
+        if not pipeline:
+            return ""
+        stats = pipeline.stats[packet.source]
+        text = f"[{packet.source}] FPS: {stats.processed.fps:.1f}  drops: {stats.dropped}"
+        if isinstance(self.detector, AdaptiveDetector):
+            text += f"  K: {self.detector.interval}"
+        return text
+    
+    def compose(self):
+        cols, rows = self.grid
+        tile_w, tile_h = self.tile_size
+        mosaic = np.zeros((tile_h * rows, tile_w * cols, 3), dtype=np.uint8)
+        for i, source in enumerate(self.caps):
+            tile = self.tiles.get(source)
+            if tile is not None:
+                row, col = divmod(i, cols)
+                mosaic[row * tile_h:(row + 1) * tile_h, col * tile_w:(col + 1) * tile_w] = tile
+        return mosaic
+    
+    def render(self):
+        if not self.is_running or not self.pipeline:
+            return
         
-        frame = cv2.resize(frame, (640, 480))
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        img = ImageTk.PhotoImage(Image.fromarray(rgb))
-        self.video_label.config(image=img)
-        self.video_label.image = img
+        packets = self.pipeline.poll()
+        if packets:
+            for source, packet in packets.items():
+                self.tiles[source] = packet.frame
+            img = ImageTk.PhotoImage(Image.fromarray(self.compose()))
+            self.video_label.config(image=img)
+            self.video_label.image = img
+            self.status_label.config(
+                text=f"Status: Detection Running ✅  {len(self.caps)} source(s), {self.pipeline.fps.fps:.1f} FPS total")
+            self.stats_reporter.report(fps=self.pipeline.fps.fps)
+        elif self.pipeline.finished:
+            self.stop_detection()
+            return
         
-        self.root.after(30, self.update)
+        # Short poll: the pipeline paces itself, this only picks up results
+        self.root.after(5, self.render)
     
     def run(self):
         def on_close():
             self.is_running = False
-            if self.cap:
-                self.cap.release()
+            self.shutdown_pipeline()
+            if self.pool:
+                self.pool.close()
             self.root.destroy()
         
         self.root.protocol("WM_DELETE_WINDOW", on_close)
+        self.root.after_idle(lambda: report_ready("object_detection.py"))
         self.root.mainloop()
 
 if __name__ == "__main__":
-    app = ObjectDetection()
+    parser = argparse.ArgumentParser(description="Real-time object detection")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="run detection in N worker processes (0 = in-process)")
+    parser.add_argument('--adaptive', action='store_true',
+                        help="run the SSD only every K frames and track boxes in between")
+    parser.add_argument('--target-fps', type=float, default=None,
+                        help="with --adaptive, tune K to hold this frame rate")
+    args = parser.parse_args()
+    app = ObjectDetection(workers=args.workers, adaptive=args.adaptive, target_fps=args.target_fps)
     app.run()
\ No newline at end of file
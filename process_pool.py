@@ -0,0 +1,154 @@
+import multiprocessing as mp
+import queue
+from multiprocessing import shared_memory
+
+import numpy as np
+
+MAX_FRAME_SHAPE = (1080, 1920, 3)
+
+
+def _worker_main(task_queue, result_queue, slot_names, conf_threshold):
+    # Each worker loads the SSD model once and then only ever exchanges slot
+    # indices and shapes with the parent; pixels stay in shared memory.
+    import cv2
+    from detector import ObjectDetector, draw_detections
+
+    slots = [shared_memory.SharedMemory(name=name) for name in slot_names]
+    try:
+        try:
+            detector = ObjectDetector(conf_threshold=conf_threshold)
+        except Exception as e:
+            result_queue.put(('failed', None, None, e))
+            return
+        result_queue.put(('ready', None, None, None))
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            seq, slot, shape, overlay, render_size = task
+            try:
+                frame = np.ndarray(shape, dtype=np.uint8, buffer=slots[slot].buf)
+                detections = detector.detect(frame)
+                out_shape = None
+                if render_size is not None:
+                    render_size = tuple(render_size)
+                    annotated = draw_detections(frame.copy(), detections, detector.class_name)
+                    if overlay:
+                        cv2.putText(annotated, overlay, (10, 30),
+                                   cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
+                    annotated = cv2.cvtColor(cv2.resize(annotated, render_size), cv2.COLOR_BGR2RGB)
+                    out_shape = annotated.shape
+                    np.ndarray(out_shape, dtype=np.uint8, buffer=slots[slot].buf)[:] = annotated
+                result_queue.put((seq, slot, out_shape, detections))
+            except Exception as e:
+                result_queue.put((seq, slot, None, e))
+    finally:
+        for shm in slots:
+            shm.close()
+
+
+class ProcessDetectorPool:
+    # Scales detection across cores with worker processes. Frames are copied
+    # into a fixed set of shared-memory slots instead of being pickled, and
+    # results are handed back strictly in submission order.
+    def __init__(self, workers=2, conf_threshold=0.5, slots=None,
+                 max_frame_shape=MAX_FRAME_SHAPE):
+        ctx = mp.get_context('spawn')
+        self.workers = max(1, workers)
+        self.slot_bytes = int(np.prod(max_frame_shape))
+        self.slots = [shared_memory.SharedMemory(create=True, size=self.slot_bytes)
+                      for _ in range(slots or self.workers * 2)]
+        self.free_slots = list(range(len(self.slots)))
+        self.task_queue = ctx.Queue()
+        self.result_queue = ctx.Queue()
+        self.processes = [
+            ctx.Process(target=_worker_main, daemon=True,
+                        args=(self.task_queue, self.result_queue,
+                              [shm.name for shm in self.slots], conf_threshold))
+            for _ in range(self.workers)
+        ]
+        for process in self.processes:
+            process.start()
+        self.ready = 0
+        self.error = None
+        self.next_submit = 0
+        self.next_result = 0
+        self.tags = {}
+        self.finished = {}
+
+    @property
+    def in_flight(self):
+        return len(self.tags)
+
+    def has_capacity(self):
+        return len(self.free_slots) > 0
+
+    def submit(self, frame, tag=None, overlay=None, render_size=None):
+        # With render_size set, the worker also draws the boxes (and overlay
+        # text), resizes and converts to RGB, returning the rendered frame.
+        if frame.nbytes > self.slot_bytes:
+            raise ValueError(f"Frame of shape {frame.shape} exceeds the shared slot size")
+        if not self.free_slots:
+            raise queue.Full
+        slot = self.free_slots.pop()
+        np.ndarray(frame.shape, dtype=np.uint8, buffer=self.slots[slot].buf)[:] = frame
+        seq = self.next_submit
+        self.next_submit += 1
+        self.tags[seq] = tag
+        self.task_queue.put((seq, slot, frame.shape, overlay, render_size))
+        return seq
+
+    def _receive(self, timeout):
+        try:
+            seq, slot, shape, detections = self.result_queue.get(timeout=timeout)
+        except queue.Empty:
+            return False
+        if seq == 'ready':
+            self.ready += 1
+            return True
+        if seq == 'failed':
+            self.error = detections
+            return True
+        frame = None
+        if shape is not None:
+            frame = np.ndarray(shape, dtype=np.uint8, buffer=self.slots[slot].buf).copy()
+        self.free_slots.append(slot)
+        self.finished[seq] = (frame, detections)
+        return True
+
+    def collect(self, timeout=0.0):
+        # Returns every in-order result that is ready as (tag, detections, frame).
+        # A failed frame comes back with the exception in place of detections;
+        # a worker that could not load the model raises here.
+        if self.next_result not in self.finished:
+            self._receive(timeout)
+        while self._receive(0):
+            pass
+        if self.error is not None:
+            raise RuntimeError(f"Detection worker failed to start: {self.error}")
+        if self.in_flight and not any(p.is_alive() for p in self.processes):
+            raise RuntimeError("All detection workers exited")
+        results = []
+        while self.next_result in self.finished:
+            frame, detections = self.finished.pop(self.next_result)
+            results.append((self.tags.pop(self.next_result), detections, frame))
+            self.next_result += 1
+        return results
+
+    def close(self):
+        for _ in self.processes:
+            self.task_queue.put(None)
+        for process in self.processes:
+            process.join(2.0)
+            if process.is_alive():
+                process.terminate()
+        for shm in self.slots:
+            shm.close()
+            shm.unlink()
+        self.slots = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
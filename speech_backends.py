@@ -0,0 +1,138 @@
+import argparse
+import json
+import os
+import time
+
+import speech_recognition as sr
+
+BACKEND_ENV = 'NEUROTASK_SPEECH_BACKEND'
+VOSK_MODEL_ENV = 'NEUROTASK_VOSK_MODEL'
+DEFAULT_BACKEND = os.environ.get(BACKEND_ENV, 'google')
+DEFAULT_VOSK_MODEL = os.environ.get(VOSK_MODEL_ENV, 'model')
+
+# Every backend takes an sr.AudioData and returns the text, raising
+# sr.UnknownValueError / sr.RequestError like speech_recognition does.
+
+
+class GoogleBackend:
+    name = 'google'
+
+    def __init__(self, recognizer):
+        self.recognizer = recognizer
+
+    def recognize(self, audio):
+        return self.recognizer.recognize_google(audio)
+
+
+class SphinxBackend:
+    # Offline, through speech_recognition + pocketsphinx
+    name = 'sphinx'
+
+    def __init__(self, recognizer, language='en-US'):
+        # speech_recognition only looks for pocketsphinx per utterance; check
+        # up front so a missing install falls back instead of failing later
+        try:
+            import pocketsphinx
+        except ImportError:
+            raise RuntimeError("PocketSphinx not installed: pip install pocketsphinx")
+        self.recognizer = recognizer
+        self.language = language
+
+    def recognize(self, audio):
+        return self.recognizer.recognize_sphinx(audio, language=self.language)
+
+
+class VoskBackend:
+    # Offline. The model is loaded once here rather than per utterance, which
+    # is what speech_recognition's recognize_vosk would do.
+    name = 'vosk'
+    sample_rate = 16000
+
+    def __init__(self, recognizer, model_path=DEFAULT_VOSK_MODEL):
+        try:
+            import vosk
+        except ImportError:
+            raise RuntimeError("Vosk not installed: pip install vosk")
+        if not os.path.isdir(model_path):
+            raise RuntimeError(f"Vosk model not found at {model_path} "
+                               f"(download one from alphacephei.com/vosk/models)")
+        vosk.SetLogLevel(-1)
+        self.vosk = vosk
+        self.model = vosk.Model(model_path)
+
+    def recognize(self, audio):
+        recognizer = self.vosk.KaldiRecognizer(self.model, self.sample_rate)
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+        text = json.loads(recognizer.FinalResult()).get('text', '')
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+BACKENDS = {backend.name: backend for backend in (GoogleBackend, SphinxBackend, VoskBackend)}
+
+
+class SpeechRecognizer:
+    # The configured backend plus per-utterance latency bookkeeping
+    def __init__(self, backend=DEFAULT_BACKEND, recognizer=None, **options):
+        if backend not in BACKENDS:
+            raise RuntimeError(f"Unknown speech backend '{backend}' "
+                               f"(choose from {', '.join(BACKENDS)})")
+        self.recognizer = recognizer or sr.Recognizer()
+        self.backend = BACKENDS[backend](self.recognizer, **options)
+        self.latencies = []
+
+    @property
+    def name(self):
+        return self.backend.name
+
+    @property
+    def last_latency(self):
+        return self.latencies[-1] if self.latencies else None
+
+    @property
+    def average_latency(self):
+        return sum(self.latencies) / len(self.latencies) if self.latencies else None
+
+    def recognize(self, audio):
+        start = time.perf_counter()
+        try:
+            return self.backend.recognize(audio)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+
+def load_wav(path, recognizer=None):
+    recognizer = recognizer or sr.Recognizer()
+    with sr.AudioFile(path) as source:
+        return recognizer.record(source)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare speech backends on WAV files")
+    parser.add_argument('wavs', nargs='+')
+    parser.add_argument('--backend', action='append', choices=list(BACKENDS),
+                        help="repeat to compare several (default: all that load)")
+    parser.add_argument('--vosk-model', default=DEFAULT_VOSK_MODEL)
+    args = parser.parse_args()
+
+    recognizers = []
+    for name in args.backend or list(BACKENDS):
+        options = {'model_path': args.vosk_model} if name == 'vosk' else {}
+        try:
+            recognizers.append(SpeechRecognizer(name, **options))
+        except Exception as e:
+            print(f"⚠️ {name} not available: {e}")
+
+    clips = [(path, load_wav(path)) for path in args.wavs]
+    for speech in recognizers:
+        print(f"\n{speech.name}")
+        for path, audio in clips:
+            try:
+                text = speech.recognize(audio)
+            except sr.UnknownValueError:
+                text = "(not understood)"
+            except sr.RequestError as e:
+                text = f"(request error: {e})"
+            print(f"   {speech.last_latency * 1000:8.1f} ms  {os.path.basename(path)}: {text}")
+        print(f"   average {speech.average_latency * 1000:.1f} ms over {len(speech.latencies)} utterance(s)")
@@ -0,0 +1,137 @@
+import collections
+import os
+import subprocess
+import sys
+import time
+import uuid
+
+from model_server import LAUNCH_ID_ENV, LAUNCH_T0_ENV
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Each camera tool runs its own detection loop, so by default only one runs
+# at a time. With camera_broker.py both can share a device; raise this to 2
+# on machines with the CPU to spare.
+MAX_CAMERA_TOOLS = int(os.environ.get('NEUROTASK_MAX_CAMERA_TOOLS', '1'))
+
+
+def read_process_usage(pid):
+    # (cpu_seconds, rss_bytes) for a child, via psutil when installed and
+    # /proc otherwise; None where neither is available
+    if psutil is not None:
+        try:
+            process = psutil.Process(pid)
+            times = process.cpu_times()
+            return times.user + times.system, process.memory_info().rss
+        except psutil.Error:
+            return None
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        cpu = (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+        rss = int(fields[21]) * os.sysconf('SC_PAGE_SIZE')
+        return cpu, rss
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class ManagedTool:
+    def __init__(self, name, command, camera=False):
+        self.name = name
+        self.command = command
+        self.camera = camera
+        self.process = None
+        self.launch_id = None
+        self.restart_times = collections.deque()
+        self.last_sample = None
+        self.cpu_percent = None
+        self.rss = None
+
+    @property
+    def running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        self.launch_id = uuid.uuid4().hex
+        env = dict(os.environ)
+        env[LAUNCH_ID_ENV] = self.launch_id
+        env[LAUNCH_T0_ENV] = repr(time.time())
+        self.process = subprocess.Popen(self.command, env=env)
+        self.last_sample = None
+        self.cpu_percent = None
+        self.rss = None
+
+    def sample(self):
+        usage = read_process_usage(self.process.pid) if self.running else None
+        if usage is None:
+            return
+        cpu, self.rss = usage
+        now = time.perf_counter()
+        if self.last_sample is not None:
+            last_cpu, last_now = self.last_sample
+            if now > last_now:
+                self.cpu_percent = 100.0 * (cpu - last_cpu) / (now - last_now)
+        self.last_sample = (cpu, now)
+
+
+class ToolSupervisor:
+    # Keeps the handles of every tool the launcher starts: refuses duplicate
+    # launches, enforces a global budget of camera consumers, restarts tools
+    # that crash (a bounded number of times per window) and samples their
+    # CPU and memory use.
+    def __init__(self, max_camera_tools=MAX_CAMERA_TOOLS, max_restarts=3, restart_window=60.0):
+        self.max_camera_tools = max_camera_tools
+        self.max_restarts = max_restarts
+        self.restart_window = restart_window
+        self.tools = {}
+
+    def camera_tools_running(self):
+        return sum(1 for tool in self.tools.values() if tool.camera and tool.running)
+
+    def launch(self, name, command=None, camera=False):
+        tool = self.tools.get(name)
+        if tool and tool.running:
+            raise RuntimeError(f"{name} is already running")
+        if camera and self.camera_tools_running() >= self.max_camera_tools:
+            raise RuntimeError(f"Camera budget reached: at most {self.max_camera_tools} "
+                               f"camera tool(s) may run at once")
+        tool = ManagedTool(name, command or [sys.executable, name], camera)
+        tool.start()
+        self.tools[name] = tool
+        return tool
+
+    def poll(self):
+        # Returns (name, event) pairs: 'exited', 'restarted' or 'crashed'
+        events = []
+        for name, tool in list(self.tools.items()):
+            if tool.running:
+                tool.sample()
+                continue
+            code = tool.process.returncode
+            if code == 0:
+                del self.tools[name]
+                events.append((name, 'exited'))
+                continue
+            now = time.monotonic()
+            while tool.restart_times and now - tool.restart_times[0] > self.restart_window:
+                tool.restart_times.popleft()
+            if len(tool.restart_times) < self.max_restarts:
+                tool.restart_times.append(now)
+                tool.start()
+                events.append((name, 'restarted'))
+            else:
+                del self.tools[name]
+                events.append((name, 'crashed'))
+        return events
+
+    def stop(self, name):
+        tool = self.tools.pop(name, None)
+        if tool and tool.running:
+            tool.process.terminate()
+
+    def shutdown(self):
+        for name in list(self.tools):
+            self.stop(name)
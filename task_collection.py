@@ -0,0 +1,152 @@
+import bisect
+
+PRIORITIES = ["Critical", "High", "Medium", "Low"]
+PRIORITY_RANK = {name: rank for rank, name in enumerate(PRIORITIES)}
+
+
+def priority_rank(priority):
+    # Unknown priorities, which task_model keeps as they are, go with Low
+    return PRIORITY_RANK.get(priority, len(PRIORITIES) - 1)
+
+
+class TaskCollection:
+    # Tasks kept in display order, (priority, created_at), as they come and
+    # go: one bisect-ordered bucket per priority, so an add or remove is a
+    # binary search within its bucket (new tasks usually land at the end)
+    # and the list is never re-sorted. Indexing walks at most four buckets,
+    # which is what the virtual list view needs to show a window of rows.
+    def __init__(self, tasks=()):
+        self.by_id = {}
+        self.buckets = [[] for _ in PRIORITIES]
+        for task in tasks:
+            self.add(task)
+
+    def _bucket(self, task):
+        return self.buckets[priority_rank(task.priority)]
+
+    def add(self, task):
+        if task.id in self.by_id:
+            self.remove(task.id)
+        self.by_id[task.id] = task
+        bucket = self._bucket(task)
+        key = (task.created_at, task.id)
+        if not bucket or bucket[-1] < key:
+            bucket.append(key)
+        else:
+            bisect.insort(bucket, key)
+
+    def remove(self, task_id):
+        task = self.by_id.pop(task_id)
+        bucket = self._bucket(task)
+        key = (task.created_at, task.id)
+        del bucket[bisect.bisect_left(bucket, key)]
+        return task
+
+    def get(self, task_id, default=None):
+        return self.by_id.get(task_id, default)
+
+    def count(self, priority):
+        return len(self.buckets[PRIORITY_RANK[priority]])
+
+    def index_of(self, task_id):
+        task = self.by_id[task_id]
+        rank = priority_rank(task.priority)
+        before = sum(len(bucket) for bucket in self.buckets[:rank])
+        return before + bisect.bisect_left(self.buckets[rank], (task.created_at, task.id))
+
+    def __contains__(self, task_id):
+        return task_id in self.by_id
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.by_id)
+        for bucket in self.buckets:
+            if index < len(bucket):
+                return self.by_id[bucket[index][1]]
+            index -= len(bucket)
+        raise IndexError("task index out of range")
+
+    def view(self, priorities):
+        return PriorityView(self, priorities)
+
+    def select(self, task_ids, priorities=PRIORITIES):
+        return SelectionView(self, task_ids, priorities)
+
+    def __iter__(self):
+        for bucket in self.buckets:
+            for _, task_id in bucket:
+                yield self.by_id[task_id]
+
+    def values(self):
+        return self.by_id.values()
+
+
+class PriorityView:
+    # Read-only, always current slice of a TaskCollection holding only some
+    # priorities; costs nothing to create, whatever the number of tasks.
+    def __init__(self, collection, priorities):
+        self.collection = collection
+        self.buckets = [collection.buckets[PRIORITY_RANK[p]] for p in PRIORITIES if p in priorities]
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.buckets)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        for bucket in self.buckets:
+            if index < len(bucket):
+                return self.collection.by_id[bucket[index][1]]
+            index -= len(bucket)
+        raise IndexError("task index out of range")
+
+    def __iter__(self):
+        for bucket in self.buckets:
+            for _, task_id in bucket:
+                yield self.collection.by_id[task_id]
+
+
+class SelectionView:
+    # The given task ids in display order, found lazily by walking the
+    # ordered buckets only as far as the rows asked for; the first screen
+    # of a broad search result is ready long before the full walk would be.
+    # Like any view it is only valid until the collection changes.
+    def __init__(self, collection, task_ids, priorities=PRIORITIES):
+        self.collection = collection
+        self.task_ids = task_ids
+        self.ranks = [PRIORITY_RANK[p] for p in PRIORITIES if p in priorities]
+        self.items = []
+        self.walker = self._walk()
+        if len(self.ranks) == len(PRIORITIES):
+            self.length = len(task_ids)
+        else:
+            # Counted by bucket, like _walk() finds them, not by exact name
+            ranks = set(self.ranks)
+            self.length = sum(1 for task_id in task_ids
+                              if priority_rank(collection.by_id[task_id].priority) in ranks)
+
+    def _walk(self):
+        by_id, task_ids = self.collection.by_id, self.task_ids
+        for rank in self.ranks:
+            for _, task_id in self.collection.buckets[rank]:
+                if task_id in task_ids:
+                    yield by_id[task_id]
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("task index out of range")
+        while len(self.items) <= index:
+            self.items.append(next(self.walker))
+        return self.items[index]
+
+    def __iter__(self):
+        for index in range(self.length):
+            yield self[index]
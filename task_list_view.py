@@ -0,0 +1,167 @@
+import tkinter as tk
+from tkinter import ttk
+
+from task_model import to_datetime
+
+ROW_HEIGHT = 112
+PRIORITY_COLORS = {
+    "Low": "#10b981",
+    "Medium": "#3b82f6",
+    "High": "#f59e0b",
+    "Critical": "#ef4444"
+}
+
+
+def format_created(created_at):
+    try:
+        return f"🕐 {to_datetime(created_at).strftime('%b %d, %I:%M %p')}"
+    except Exception:
+        return ""
+
+
+def one_line(text, limit=110):
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+class TaskRow:
+    # The widgets of one list row. Rows are created once and re-bound to
+    # whichever task scrolls into their slot.
+    def __init__(self, view):
+        self.view = view
+        self.task = None
+        self.frame = tk.Frame(view.canvas, bg='#0f172a', relief='solid', bd=1, pady=10)
+        self.bar = tk.Frame(self.frame, width=5)
+        self.bar.pack(side='left', fill='y', padx=(0, 15))
+
+        content = tk.Frame(self.frame, bg='#0f172a')
+        content.pack(side='left', fill='both', expand=True)
+
+        title_frame = tk.Frame(content, bg='#0f172a')
+        title_frame.pack(fill='x', padx=10, pady=(5, 2))
+        self.title = tk.Label(title_frame, font=('Helvetica', 11, 'bold'),
+                              bg='#0f172a', fg='white', anchor='w')
+        self.title.pack(side='left', fill='x', expand=True)
+        self.created = tk.Label(title_frame, font=('Helvetica', 8), bg='#0f172a', fg='#64748b')
+        self.created.pack(side='right')
+
+        self.description = tk.Label(content, font=('Helvetica', 9), bg='#0f172a', fg='#94a3b8',
+                                    anchor='w', justify='left')
+        self.description.pack(fill='x', padx=10, pady=(0, 5))
+        self.priority = tk.Label(content, font=('Helvetica', 9), bg='#0f172a', anchor='w')
+        self.priority.pack(fill='x', padx=10, pady=(0, 5))
+
+        btn_frame = tk.Frame(self.frame, bg='#0f172a')
+        btn_frame.pack(side='right', padx=15)
+        tk.Button(btn_frame, text="✅ Complete", command=lambda: view.on_complete(self.task.id),
+                 bg='#10b981', fg='white', font=('Helvetica', 9, 'bold'),
+                 relief='flat', padx=12, pady=5, cursor='hand2').pack(pady=(0, 5))
+        tk.Button(btn_frame, text="🗑️ Delete", command=lambda: view.on_delete(self.task.id),
+                 bg='#ef4444', fg='white', font=('Helvetica', 9, 'bold'),
+                 relief='flat', padx=12, pady=5, cursor='hand2').pack()
+
+        self.item = view.canvas.create_window(0, 0, window=self.frame, anchor='nw',
+                                              height=ROW_HEIGHT - 10, state='hidden')
+        for widget in (self.frame, content, title_frame, self.title, self.created,
+                       self.description, self.priority, btn_frame):
+            view.bind_wheel(widget)
+
+    def bind(self, task):
+        # Only touch the labels when the slot now shows a different task
+        if task is self.task:
+            return
+        self.task = task
+        color = PRIORITY_COLORS.get(task.priority, '#64748b')
+        self.bar.config(bg=color)
+        self.title.config(text=f"📋 {task.title}")
+        self.created.config(text=format_created(task.created_at))
+        self.description.config(text=one_line(task.description))
+        self.priority.config(text=f"🎯 Priority: {task.priority}", fg=color)
+
+    def place(self, y, width):
+        self.view.canvas.coords(self.item, 10, y + 5)
+        self.view.canvas.itemconfigure(self.item, width=max(1, width - 20), state='normal')
+
+    def hide(self):
+        self.task = None
+        self.view.canvas.itemconfigure(self.item, state='hidden')
+
+
+class VirtualTaskList:
+    # Scrollable task list that only has widgets for the rows on screen.
+    # `tasks` is any sequence (len() and indexing); after a change call
+    # refresh(), which re-binds the visible rows and nothing else, so the
+    # cost depends on the window height, not on the number of tasks.
+    def __init__(self, parent, on_complete, on_delete,
+                 empty_text="🎯 No tasks yet! Add your first task above."):
+        self.empty_text = empty_text
+        self.on_complete = on_complete
+        self.on_delete = on_delete
+        self.tasks = []
+        self.rows = []
+        self.canvas = tk.Canvas(parent, bg='#1e293b', highlightthickness=0,
+                                yscrollincrement=ROW_HEIGHT // 4)
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.yview)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.pack(side="left", fill="both", expand=True, padx=(10, 0), pady=(0, 10))
+        self.scrollbar.pack(side="right", fill="y", pady=(0, 10))
+        self.empty = self.canvas.create_text(0, 50, text=empty_text, font=('Helvetica', 12),
+                                             fill='#94a3b8', anchor='n', state='hidden')
+        self.canvas.bind('<Configure>', lambda e: self.refresh())
+        self.bind_wheel(self.canvas)
+
+    def bind_wheel(self, widget):
+        widget.bind('<MouseWheel>', self.on_wheel)
+        widget.bind('<Button-4>', lambda e: self.yview('scroll', -1, 'units'))
+        widget.bind('<Button-5>', lambda e: self.yview('scroll', 1, 'units'))
+
+    def on_wheel(self, event):
+        self.yview('scroll', -1 if event.delta > 0 else 1, 'units')
+
+    def yview(self, *args):
+        self.canvas.yview(*args)
+        self.layout()
+
+    def set_tasks(self, tasks, empty_text=None):
+        self.tasks = tasks
+        self.canvas.itemconfigure(self.empty, text=empty_text or self.empty_text)
+        self.refresh()
+
+    def refresh(self):
+        width = self.canvas.winfo_width()
+        height = max(self.canvas.winfo_height(), ROW_HEIGHT)
+        total = max(height, len(self.tasks) * ROW_HEIGHT)
+        self.canvas.configure(scrollregion=(0, 0, width, total))
+        # Removing tasks near the end can leave the view past the last row
+        if self.canvas.canvasy(0) > total - height:
+            self.canvas.yview_moveto((total - height) / total)
+        # One row per visible slot plus one for the partly visible row
+        needed = height // ROW_HEIGHT + 2
+        while len(self.rows) < needed:
+            self.rows.append(TaskRow(self))
+        self.canvas.coords(self.empty, width // 2, 50)
+        self.canvas.itemconfigure(self.empty, state='normal' if not self.tasks else 'hidden')
+        self.layout()
+
+    def see(self, index):
+        # Scroll just enough for row `index` to be fully on screen
+        height = max(self.canvas.winfo_height(), ROW_HEIGHT)
+        total = max(height, len(self.tasks) * ROW_HEIGHT)
+        top = self.canvas.canvasy(0)
+        y = index * ROW_HEIGHT
+        if y < top:
+            self.canvas.yview_moveto(y / total)
+        elif y + ROW_HEIGHT > top + height:
+            self.canvas.yview_moveto((y + ROW_HEIGHT - height) / total)
+        self.layout()
+
+    def layout(self):
+        width = self.canvas.winfo_width()
+        first = max(0, int(self.canvas.canvasy(0)) // ROW_HEIGHT)
+        for offset, row in enumerate(self.rows):
+            index = first + offset
+            if index < len(self.tasks):
+                row.bind(self.tasks[index])
+                row.place(index * ROW_HEIGHT, width)
+            else:
+                row.hide()
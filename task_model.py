@@ -0,0 +1,154 @@
+import datetime
+import enum
+import json
+import sys
+import uuid
+from json.encoder import encode_basestring_ascii as quote
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+EPOCH = datetime.datetime(1970, 1, 1)
+EPOCH_DAY = EPOCH.toordinal()
+
+
+class Priority(str, enum.Enum):
+    # One shared object per priority. Members are strings, so they compare,
+    # hash and print like the names used everywhere else ("High" and so on).
+    CRITICAL = "Critical"
+    HIGH = "High"
+    MEDIUM = "Medium"
+    LOW = "Low"
+
+    __str__ = str.__str__
+    __format__ = str.__format__
+    __hash__ = str.__hash__
+
+
+PRIORITY_BY_NAME = {priority.value: priority for priority in Priority}
+
+
+def parse_priority(name):
+    # Unknown names from older or hand-edited files are kept as they are
+    return PRIORITY_BY_NAME.get(name) or sys.intern(name)
+
+
+def format_id(task_id):
+    text = task_id.hex()
+    return f"{text[:8]}-{text[8:12]}-{text[12:16]}-{text[16:20]}-{text[20:]}"
+
+
+def parse_id(text):
+    task_id = bytes.fromhex(text.replace("-", ""))
+    if len(task_id) != 16:
+        raise ValueError(f"Task id '{text}' is not a UUID")
+    return task_id
+
+
+def to_timestamp(value):
+    # Naive local time, as datetime.now() gives it, in microseconds. Plain
+    # arithmetic is several times faster than timedelta division.
+    days = value.toordinal() - EPOCH_DAY
+    seconds = days * 86400 + value.hour * 3600 + value.minute * 60 + value.second
+    return seconds * 1000000 + value.microsecond
+
+
+def to_datetime(timestamp):
+    return EPOCH + datetime.timedelta(microseconds=timestamp)
+
+
+def format_timestamp(timestamp):
+    return to_datetime(timestamp).isoformat()
+
+
+def parse_timestamp(text):
+    value = datetime.datetime.fromisoformat(text)
+    if value.tzinfo is not None:
+        # Written with an offset: the same instant in local time, like the rest
+        value = value.astimezone().replace(tzinfo=None)
+    return to_timestamp(value)
+
+
+class Task:
+    # Slotted, so there is no per-task __dict__: the id is the 16 raw UUID
+    # bytes, created_at is an integer (microseconds) and the priority is a
+    # shared Priority member. to_dict()/from_dict() convert to and from the
+    # tasks.json schema (string UUID, ISO timestamp).
+    __slots__ = ('id', 'title', 'description', 'priority', 'created_at')
+
+    def __init__(self, title, description="", priority="Medium"):
+        self.id = uuid.uuid4().bytes
+        self.title = title
+        self.description = description
+        self.priority = parse_priority(priority)
+        self.created_at = to_timestamp(datetime.datetime.now())
+
+    def to_dict(self):
+        return {
+            'id': format_id(self.id),
+            'title': self.title,
+            'description': self.description,
+            'priority': str(self.priority),
+            'created_at': format_timestamp(self.created_at)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        # Skips __init__: no throwaway uuid4() and clock read per loaded task
+        task = cls.__new__(cls)
+        task.id = parse_id(data['id'])
+        task.title = data['title']
+        task.description = data.get('description', '')
+        task.priority = parse_priority(data['priority'])
+        task.created_at = parse_timestamp(data['created_at'])
+        return task
+
+
+def parse_task(data):
+    # None for a row that isn't a valid task (a hand-edited id, a missing
+    # field), so one bad row doesn't fail a whole load
+    try:
+        return Task.from_dict(data)
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
+def dumps_tasks(tasks, extra=None):
+    # The tasks.json document, as json.dump(..., indent=2) would write it,
+    # formatted straight from the slots instead of through a dict per task
+    # (faster than building the dicts for orjson). `extra` maps keys to raw
+    # rows written back as they are, e.g. ones parse_task() couldn't read.
+    entries = []
+    for task in tasks:
+        task_id = format_id(task.id)
+        entries.append(f'  "{task_id}": {{\n'
+                       f'    "id": "{task_id}",\n'
+                       f'    "title": {quote(task.title)},\n'
+                       f'    "description": {quote(task.description)},\n'
+                       f'    "priority": {quote(task.priority)},\n'
+                       f'    "created_at": "{format_timestamp(task.created_at)}"\n'
+                       f'  }}')
+    for key, data in (extra or {}).items():
+        entries.append(f'  {quote(key)}: ' + json.dumps(data, indent=2).replace('\n', '\n  '))
+    if not entries:
+        return b"{}"
+    return ("{\n" + ",\n".join(entries) + "\n}").encode('ascii')
+
+
+def loads_json(data):
+    # Parsing is where orjson helps, when it is installed
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def loads_tasks(data):
+    # (tasks, invalid): invalid maps the keys of unreadable rows to the rows
+    tasks, invalid = [], {}
+    for key, row in loads_json(data).items():
+        task = parse_task(row)
+        if task is None:
+            invalid[key] = row
+        else:
+            tasks.append(task)
+    return tasks, invalid
@@ -0,0 +1,83 @@
+import bisect
+import re
+
+from task_collection import PRIORITIES, priority_rank
+
+WORD = re.compile(r"\w+")
+# Shorter query words only match whole words; a one-letter prefix would
+# pull in a large share of the vocabulary
+MIN_PREFIX = 2
+
+
+def tokenize(text):
+    return set(WORD.findall(text.lower()))
+
+
+class TaskSearchIndex:
+    # Inverted index from title/description words to task ids over a
+    # TaskCollection, updated as tasks are added and removed. Every query
+    # word is a prefix ("rep" finds "report"): the sorted vocabulary is
+    # bisected to the range of words sharing it. All words must match, and
+    # results come back in the collection's (priority, created_at) order.
+    def __init__(self, collection):
+        self.collection = collection
+        self.postings = {}
+        self.vocabulary = []
+        for task in collection:
+            self.add(task)
+
+    def _tokens(self, task):
+        return tokenize(f"{task.title} {task.description}")
+
+    def add(self, task):
+        for token in self._tokens(task):
+            ids = self.postings.get(token)
+            if ids is None:
+                ids = self.postings[token] = set()
+                bisect.insort(self.vocabulary, token)
+            ids.add(task.id)
+
+    def remove(self, task):
+        for token in self._tokens(task):
+            ids = self.postings.get(token)
+            if ids is None:
+                continue
+            ids.discard(task.id)
+            if not ids:
+                del self.postings[token]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, token)]
+
+    def _prefix_matches(self, prefix):
+        if len(prefix) < MIN_PREFIX:
+            return self.postings.get(prefix, set())
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        end = bisect.bisect_left(self.vocabulary, prefix + "\uffff", start)
+        sets = [self.postings[token] for token in self.vocabulary[start:end]]
+        if len(sets) == 1:
+            return sets[0]
+        return set().union(*sets)
+
+    def search(self, query="", priorities=None):
+        # Returns a sequence for the list view: a view of the collection
+        # when there are no words or many matches, a sorted list otherwise
+        selected = [p for p in PRIORITIES if not priorities or p in priorities]
+        matches = None
+        # Longest words first: they tend to have the smallest postings
+        for word in sorted(tokenize(query), key=len, reverse=True):
+            ids = self._prefix_matches(word)
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                return []
+        if matches is None:
+            return self.collection.view(selected)
+        if len(matches) * 8 > len(self.collection):
+            # Broad queries: walking the ordered buckets lazily beats sorting
+            return self.collection.select(matches, selected)
+        tasks = [self.collection.get(task_id) for task_id in matches]
+        # By bucket, as the collection orders them, so a task with an
+        # unknown priority shows up under Low here too
+        if len(selected) < len(PRIORITIES):
+            ranks = {priority_rank(p) for p in selected}
+            tasks = [task for task in tasks if priority_rank(task.priority) in ranks]
+        tasks.sort(key=lambda t: (priority_rank(t.priority), t.created_at, t.id))
+        return tasks
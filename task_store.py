@@ -0,0 +1,268 @@
+import json
+import os
+import sqlite3
+
+from task_model import Task, dumps_tasks, format_id, loads_json, loads_tasks, parse_id, parse_task
+
+STORE_ENV = 'NEUROTASK_TASK_STORE'
+DEFAULT_STORE = os.environ.get(STORE_ENV, 'sqlite')
+JSON_FILE = "tasks.json"
+SQLITE_FILE = "tasks.db"
+JOURNAL_SUFFIX = ".journal"
+COMPACT_EVERY = 1000
+
+PRIORITY_RANK = {"Critical": 0, "High": 1, "Medium": 2, "Low": 3}
+FIELDS = ('id', 'title', 'description', 'priority', 'created_at')
+
+# All stores take and return task_model.Task objects: load() -> list,
+# add(task), delete(task_id), close(), and write(changes) for a batch,
+# changes mapping task id -> Task, or None for a deleted task. On disk they
+# keep the tasks.json schema (Task.to_dict()).
+
+
+def report_skipped(count, path):
+    if count:
+        print(f"⚠️ Skipped {count} unreadable task(s) in {path}")
+
+
+def write_atomic(path, data):
+    # Readers (and a crash) see either the old file or the new one, never a
+    # half-written mix: write a temp file, fsync it, rename it over the target
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    if hasattr(os, 'O_DIRECTORY'):
+        # Make the rename itself durable
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class JsonTaskStore:
+    # The original format: the whole file is rewritten on every change.
+    # `tasks` holds the same Task objects the app shows, not copies, and
+    # rows that could not be read are kept as they are and written back.
+    def __init__(self, path=JSON_FILE):
+        self.path = path
+        self.tasks = {}
+        self.invalid = {}
+        self.notice = None
+
+    def load(self):
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as f:
+                tasks, self.invalid = loads_tasks(f.read())
+            self.tasks = {task.id: task for task in tasks}
+            report_skipped(len(self.invalid), self.path)
+        return list(self.tasks.values())
+
+    def save(self):
+        write_atomic(self.path, dumps_tasks(self.tasks.values(), self.invalid))
+
+    def apply(self, changes):
+        for task_id, task in changes.items():
+            if task is None:
+                self.tasks.pop(task_id, None)
+            else:
+                self.tasks[task_id] = task
+
+    def write(self, changes):
+        self.apply(changes)
+        self.save()
+
+    def add(self, task):
+        self.write({task.id: task})
+
+    def delete(self, task_id):
+        if task_id in self.tasks:
+            self.write({task_id: None})
+
+    def close(self):
+        pass
+
+
+class JournalTaskStore(JsonTaskStore):
+    # tasks.json plus an append-only journal next to it (tasks.json.journal),
+    # one JSON line per changed task. A write appends and fsyncs only the
+    # changes; every COMPACT_EVERY entries, and on close, the journal is
+    # folded into a fresh tasks.json (written atomically) and emptied.
+    # tasks.json on its own is always a complete, older snapshot, and
+    # replaying the journal over it twice gives the same result, so a
+    # crash at any point loses at most the change being appended.
+    def __init__(self, path=JSON_FILE, compact_every=COMPACT_EVERY):
+        super().__init__(path)
+        self.journal_path = path + JOURNAL_SUFFIX
+        self.compact_every = compact_every
+        self.entries = 0
+        self.journal = None
+
+    def load(self):
+        super().load()
+        if os.path.exists(self.journal_path):
+            skipped = 0
+            with open(self.journal_path, 'rb') as f:
+                for line in f:
+                    try:
+                        entry = loads_json(line)
+                    except ValueError:
+                        # A torn last line from a crash mid-append
+                        break
+                    try:
+                        task_id = parse_id(entry['id'])
+                        task = None if entry['task'] is None else Task.from_dict(entry['task'])
+                    except (AttributeError, KeyError, TypeError, ValueError):
+                        skipped += 1
+                        continue
+                    self.apply({task_id: task})
+                    self.entries += 1
+            report_skipped(skipped, self.journal_path)
+            # Start from a clean journal: a torn line would otherwise run into
+            # the next append
+            if os.path.getsize(self.journal_path):
+                self.compact()
+        return list(self.tasks.values())
+
+    def write(self, changes):
+        if self.journal is None:
+            self.journal = open(self.journal_path, 'ab')
+        lines = [json.dumps({'id': format_id(task_id),
+                             'task': None if task is None else task.to_dict()}) + "\n"
+                 for task_id, task in changes.items()]
+        self.journal.write("".join(lines).encode('utf-8'))
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+        self.apply(changes)
+        self.entries += len(changes)
+        if self.entries >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        self.save()
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        write_atomic(self.journal_path, b"")
+        self.entries = 0
+
+    def close(self):
+        if self.entries:
+            self.compact()
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+
+class SqliteTaskStore:
+    # One row per task in WAL mode: adding or removing a task is a single-row
+    # write, and a crash can't leave a half-written file behind. Rows come
+    # back in list order straight from the (rank, created_at) index.
+    def __init__(self, path=SQLITE_FILE):
+        self.path = path
+        self.notice = None
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS tasks (
+                                     id TEXT PRIMARY KEY,
+                                     title TEXT NOT NULL,
+                                     description TEXT NOT NULL DEFAULT '',
+                                     priority TEXT NOT NULL,
+                                     rank INTEGER NOT NULL,
+                                     created_at TEXT NOT NULL)""")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS tasks_by_priority ON tasks (rank, created_at)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS tasks_by_created ON tasks (created_at)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def load(self):
+        rows = self.conn.execute("SELECT id, title, description, priority, created_at "
+                                 "FROM tasks ORDER BY rank, created_at")
+        tasks = [parse_task(dict(zip(FIELDS, row))) for row in rows]
+        # Unreadable rows stay in the table; they are just not shown
+        report_skipped(tasks.count(None), self.path)
+        return [task for task in tasks if task is not None]
+
+    def _row(self, task):
+        task = task.to_dict()
+        return (task['id'], task['title'], task['description'], task['priority'],
+                PRIORITY_RANK.get(task['priority'], len(PRIORITY_RANK)), task['created_at'])
+
+    def add(self, task):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?)", self._row(task))
+
+    def add_many(self, tasks):
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?)",
+                                  [self._row(task) for task in tasks])
+
+    def delete(self, task_id):
+        with self.conn:
+            self.conn.execute("DELETE FROM tasks WHERE id = ?", (format_id(task_id),))
+
+    def write(self, changes):
+        # One transaction for the whole batch
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?)",
+                                  [self._row(task) for task in changes.values() if task is not None])
+            self.conn.executemany("DELETE FROM tasks WHERE id = ?",
+                                  [(format_id(task_id),) for task_id, task in changes.items()
+                                   if task is None])
+
+    def get_meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def close(self):
+        self.conn.close()
+
+
+def migrate_json(store, json_path=JSON_FILE):
+    # One-time import of an existing tasks.json into SQLite. The file is
+    # kept as tasks.json.migrated so nothing is lost if the import is wrong.
+    if store.get_meta('migrated_from_json') or not os.path.exists(json_path):
+        return 0
+    tasks = JsonTaskStore(json_path).load()
+    store.add_many(tasks)
+    store.set_meta('migrated_from_json', json_path)
+    os.replace(json_path, json_path + ".migrated")
+    print(f"✅ Migrated {len(tasks)} task(s) from {json_path} to {store.path}")
+    return len(tasks)
+
+
+def other_store_notice(directory="."):
+    # The json/journal stores can't see tasks the SQLite store holds; say
+    # where they are instead of silently showing a shorter (or empty) list
+    json_path = os.path.join(directory, JSON_FILE)
+    db_path = os.path.join(directory, SQLITE_FILE)
+    if not os.path.exists(db_path):
+        return None
+    if not os.path.exists(json_path) and os.path.exists(json_path + ".migrated"):
+        return (f"{json_path} was imported into {db_path} (the original is kept as "
+                f"{json_path}.migrated). Run with --store sqlite to see those tasks.")
+    return (f"{db_path} holds tasks saved with the SQLite store, which this store does "
+            f"not read. Run with --store sqlite to see them.")
+
+
+def open_task_store(kind=DEFAULT_STORE, directory="."):
+    if kind in ('json', 'journal'):
+        cls = JsonTaskStore if kind == 'json' else JournalTaskStore
+        store = cls(os.path.join(directory, JSON_FILE))
+        store.notice = other_store_notice(directory)
+        if store.notice:
+            print(f"⚠️ {store.notice}")
+        return store
+    if kind == 'sqlite':
+        store = SqliteTaskStore(os.path.join(directory, SQLITE_FILE))
+        migrate_json(store, os.path.join(directory, JSON_FILE))
+        return store
+    raise RuntimeError(f"Unknown task store '{kind}' (choose json, journal or sqlite)")
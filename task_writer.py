@@ -0,0 +1,99 @@
+import threading
+import time
+
+SAVE_DELAY = 0.5
+MAX_SAVE_DELAY = 3.0
+
+
+class TaskWriter:
+    # Saves task changes on a background thread so a slow disk never stalls
+    # the Tk thread. add()/delete() only record the change; the thread waits
+    # until changes stop coming for `delay` seconds (at most `max_delay`
+    # after the first one) and hands the store one merged batch, in which
+    # only the last change per task survives. close() writes whatever is
+    # still pending and closes the store, or raises if that fails, with
+    # the changes kept and the writer running again so the caller can retry.
+    def __init__(self, store, delay=SAVE_DELAY, max_delay=MAX_SAVE_DELAY):
+        self.store = store
+        self.delay = delay
+        self.max_delay = max_delay
+        self.pending = {}
+        self.last_change = 0.0
+        self.closing = False
+        self.batches = 0
+        self.cond = threading.Condition()
+        self.start()
+
+    def start(self):
+        self.closing = False
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def _change(self, task_id, task):
+        with self.cond:
+            self.pending[task_id] = task
+            self.last_change = time.monotonic()
+            self.cond.notify()
+
+    def add(self, task):
+        self._change(task.id, task)
+
+    def delete(self, task_id):
+        self._change(task_id, None)
+
+    def _next_batch(self):
+        with self.cond:
+            while not self.pending and not self.closing:
+                self.cond.wait()
+            first = time.monotonic()
+            while not self.closing:
+                now = time.monotonic()
+                remaining = min(self.last_change + self.delay, first + self.max_delay) - now
+                if remaining <= 0:
+                    break
+                self.cond.wait(remaining)
+            changes, self.pending = self.pending, {}
+            return changes
+
+    def run(self):
+        while True:
+            changes = self._next_batch()
+            if changes:
+                try:
+                    self.store.write(changes)
+                    self.batches += 1
+                except Exception as e:
+                    print(f"Save error: {e}")
+                    with self.cond:
+                        # Keep the failed changes unless newer ones replaced them
+                        for task_id, task in changes.items():
+                            self.pending.setdefault(task_id, task)
+                        if self.closing:
+                            return
+                    time.sleep(self.delay)
+                    continue
+            with self.cond:
+                if self.closing and not self.pending:
+                    return
+
+    def close(self, timeout=10):
+        with self.cond:
+            self.closing = True
+            self.cond.notify()
+        self.thread.join(timeout)
+        if self.thread.is_alive():
+            raise RuntimeError(f"Saving is still running after {timeout}s")
+        with self.cond:
+            changes, self.pending = self.pending, {}
+        if changes:
+            # The last batch failed on the thread; one more try here, where
+            # the error reaches the caller instead of only being printed
+            try:
+                self.store.write(changes)
+            except Exception as e:
+                with self.cond:
+                    for task_id, task in changes.items():
+                        self.pending.setdefault(task_id, task)
+                self.start()
+                raise RuntimeError(f"{len(changes)} change(s) could not be saved: {e}")
+        self.store.close()
@@ -0,0 +1,47 @@
+from task_collection import TaskCollection
+from task_model import Task
+from task_search import TaskSearchIndex
+
+
+def make_index(matching, filler):
+    # "Urgent" is not a known priority: the collection files it under Low
+    tasks = []
+    for i in range(matching):
+        priority = ["Critical", "High", "Medium", "Low", "Urgent"][i % 5]
+        tasks.append(Task(f"fix email {i}", "", priority))
+    tasks += [Task(f"other {i}", "", "Medium") for i in range(filler)]
+    for created_at, task in enumerate(tasks):
+        task.created_at = created_at
+    collection = TaskCollection(tasks)
+    return collection, TaskSearchIndex(collection)
+
+
+def expected(collection, priorities=None):
+    return [task for task in collection if task.title.startswith("fix")
+            and (priorities is None or task in collection.view(priorities))]
+
+
+def check(matching, filler):
+    collection, index = make_index(matching, filler)
+    for priorities in (None, {"Low"}, {"High", "Critical"}):
+        results = index.search("fix email", priorities)
+        want = expected(collection, priorities)
+        assert len(results) == len(want), (priorities, len(results), len(want))
+        assert list(results) == want, priorities
+        assert [results[i] for i in range(len(results))] == want, priorities
+
+
+def test_unknown_priority_narrow():
+    # Few matches: the sorted-list path
+    check(10, 200)
+
+
+def test_unknown_priority_broad():
+    # Most tasks match: the lazy SelectionView path
+    check(50, 10)
+
+
+if __name__ == "__main__":
+    test_unknown_priority_narrow()
+    test_unknown_priority_broad()
+    print("✅ Task search tests passed")
@@ -1,44 +1,27 @@
+import argparse
 import tkinter as tk
 from tkinter import ttk, messagebox
-import json
-import os
-import datetime
-import uuid
-
-class Task:
-    def __init__(self, title, description="", priority="Medium"):
-        self.id = str(uuid.uuid4())
-        self.title = title
-        self.description = description
-        self.priority = priority
-        self.created_at = datetime.datetime.now().isoformat()
-    
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'description': self.description,
-            'priority': self.priority,
-            'created_at': self.created_at
-        }
-    
-    @classmethod
-    def from_dict(cls, data):
-        task = cls(data['title'], data['description'], data['priority'])
-        task.id = data['id']
-        task.created_at = data['created_at']
-        return task
+from model_server import benchmark_mode, report_ready
+from task_collection import PRIORITIES, TaskCollection
+from task_list_view import VirtualTaskList
+from task_model import Task
+from task_search import TaskSearchIndex
+from task_store import DEFAULT_STORE, open_task_store
+from task_writer import TaskWriter
 
 class TodoList:
-    def __init__(self):
+    def __init__(self, store=DEFAULT_STORE):
         self.root = tk.Tk()
         self.root.title("✅ To-Do List")
         self.root.geometry("900x800")
         self.root.configure(bg='#0f172a')
         
-        self.tasks = {}
-        self.data_file = "tasks.json"
+        self.tasks = TaskCollection()
+        self.store = open_task_store(store)
         self.load_tasks()
+        # Saves happen on a background thread, batched after a short pause
+        self.writer = TaskWriter(self.store)
+        self.search_after = None
         self.setup_gui()
     
     def setup_gui(self):
@@ -92,6 +75,25 @@ class TodoList:
                                    bg='#1e293b', fg='white', pady=10)
         self.stats_label.pack()
         
+        search_frame = tk.Frame(stats_frame, bg='#1e293b')
+        search_frame.pack(fill='x', padx=20, pady=(0, 10))
+        
+        tk.Label(search_frame, text="🔍 Search:", font=('Helvetica', 11, 'bold'),
+                bg='#1e293b', fg='white').pack(side='left')
+        
+        self.search_entry = tk.Entry(search_frame, font=('Helvetica', 10),
+                                     relief='flat', bd=5, bg='#0f172a', fg='white',
+                                     insertbackground='white')
+        self.search_entry.pack(side='left', fill='x', expand=True, padx=(10, 20))
+        self.search_entry.bind('<KeyRelease>', lambda e: self.schedule_search())
+        
+        self.filter_var = tk.StringVar(value="All")
+        filter_menu = ttk.Combobox(search_frame, textvariable=self.filter_var,
+                                  values=["All"] + PRIORITIES,
+                                  state="readonly", width=10)
+        filter_menu.pack(side='right')
+        filter_menu.bind('<<ComboboxSelected>>', lambda e: self.refresh_tasks())
+        
         list_frame = tk.Frame(self.root, bg='#1e293b', relief='raised', bd=2)
         list_frame.pack(fill='both', expand=True, padx=20, pady=(0, 20))
         
@@ -99,23 +101,14 @@ class TodoList:
                 font=('Helvetica', 12, 'bold'),
                 bg='#1e293b', fg='white').pack(anchor='w', padx=20, pady=(15, 10))
         
-        canvas = tk.Canvas(list_frame, bg='#1e293b', highlightthickness=0)
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=canvas.yview)
-        self.scroll_frame = tk.Frame(canvas, bg='#1e293b')
-        
-        self.scroll_frame.bind("<Configure>", 
-                              lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        
-        canvas.create_window((0, 0), window=self.scroll_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        canvas.pack(side="left", fill="both", expand=True, padx=(10, 0), pady=(0, 10))
-        scrollbar.pack(side="right", fill="y", pady=(0, 10))
+        # Only the rows on screen get widgets; they are recycled while scrolling
+        self.task_view = VirtualTaskList(list_frame, on_complete=self.complete_task,
+                                         on_delete=self.delete_task)
         
         footer = tk.Frame(self.root, bg='#0f172a')
         footer.pack(fill='x', side='bottom', pady=(0, 10))
         
-        tk.Label(footer, text="💡 Press Enter to quickly add tasks | Tasks auto-save",
+        tk.Label(footer, text="💡 Press Enter to quickly add tasks | Search matches word prefixes | Tasks auto-save",
                 font=('Helvetica', 9), bg='#0f172a', fg='#94a3b8').pack()
         
         self.refresh_tasks()
@@ -130,129 +123,110 @@ class TodoList:
         priority = self.priority_var.get()
         
         task = Task(title, description, priority)
-        self.tasks[task.id] = task
+        self.tasks.add(task)
+        self.search_index.add(task)
         
         self.task_entry.delete(0, tk.END)
         self.desc_entry.delete("1.0", tk.END)
         self.priority_var.set("Medium")
         
         self.refresh_tasks()
-        self.save_tasks()
+        # Show where the new task landed (unless a search hides it)
+        if self.task_view.tasks is self.tasks:
+            self.task_view.see(self.tasks.index_of(task.id))
+        self.save_task(task)
         self.task_entry.focus()
     
+    def schedule_search(self):
+        # Wait for a pause in typing instead of searching on every key
+        if self.search_after is not None:
+            self.root.after_cancel(self.search_after)
+        self.search_after = self.root.after(150, self.refresh_tasks)
+    
     def refresh_tasks(self):
-        for widget in self.scroll_frame.winfo_children():
-            widget.destroy()
-        
-        priority_order = {"Critical": 0, "High": 1, "Medium": 2, "Low": 3}
-        sorted_tasks = sorted(self.tasks.values(), key=lambda t: priority_order[t.priority])
-        
-        if not sorted_tasks:
-            tk.Label(self.scroll_frame, text="🎯 No tasks yet! Add your first task above.",
-                    font=('Helvetica', 12), bg='#1e293b', fg='#94a3b8',
-                    pady=50).pack()
+        self.search_after = None
+        query = self.search_entry.get().strip()
+        priority = self.filter_var.get()
+        # The collection is already in display order; the view reads rows from it
+        if not query and priority == "All":
+            shown = self.tasks
         else:
-            for task in sorted_tasks:
-                self.create_task_widget(task)
-        
-        self.stats_label.config(text=f"📊 Total Tasks: {len(self.tasks)}")
-    
-    def create_task_widget(self, task):
-        colors = {
-            "Low": "#10b981",
-            "Medium": "#3b82f6",
-            "High": "#f59e0b",
-            "Critical": "#ef4444"
-        }
-        
-        frame = tk.Frame(self.scroll_frame, bg='#0f172a', relief='solid', bd=1, pady=10)
-        frame.pack(fill='x', padx=10, pady=5)
-        
-        tk.Frame(frame, bg=colors[task.priority], width=5).pack(side='left', fill='y', padx=(0, 15))
-        
-        content = tk.Frame(frame, bg='#0f172a')
-        content.pack(side='left', fill='both', expand=True)
-        
-        title_frame = tk.Frame(content, bg='#0f172a')
-        title_frame.pack(fill='x', padx=10, pady=(5, 2))
-        
-        tk.Label(title_frame, text=f"📋 {task.title}", font=('Helvetica', 11, 'bold'),
-                bg='#0f172a', fg='white', anchor='w').pack(side='left', fill='x', expand=True)
-        
-        try:
-            created = datetime.datetime.fromisoformat(task.created_at)
-            time_str = created.strftime("%b %d, %I:%M %p")
-            tk.Label(title_frame, text=f"🕐 {time_str}", font=('Helvetica', 8),
-                    bg='#0f172a', fg='#64748b').pack(side='right')
-        except:
-            pass
-        
-        if task.description:
-            tk.Label(content, text=task.description, font=('Helvetica', 9),
-                    bg='#0f172a', fg='#94a3b8', anchor='w', 
-                    wraplength=500, justify='left').pack(fill='x', padx=10, pady=(0, 5))
-        
-        tk.Label(content, text=f"🎯 Priority: {task.priority}", font=('Helvetica', 9),
-                bg='#0f172a', fg=colors[task.priority], anchor='w').pack(fill='x', padx=10, pady=(0, 5))
-        
-        btn_frame = tk.Frame(frame, bg='#0f172a')
-        btn_frame.pack(side='right', padx=15)
-        
-        tk.Button(btn_frame, text="✅ Complete", command=lambda: self.complete_task(task.id),
-                 bg='#10b981', fg='white', font=('Helvetica', 9, 'bold'),
-                 relief='flat', padx=12, pady=5, cursor='hand2').pack(pady=(0, 5))
-        
-        tk.Button(btn_frame, text="🗑️ Delete", command=lambda: self.delete_task(task.id),
-                 bg='#ef4444', fg='white', font=('Helvetica', 9, 'bold'),
-                 relief='flat', padx=12, pady=5, cursor='hand2').pack()
+            shown = self.search_index.search(query, None if priority == "All" else {priority})
+        self.task_view.set_tasks(shown, None if shown is self.tasks else "🔍 No matching tasks.")
+        counts = "  ".join(f"{p}: {self.tasks.count(p)}" for p in PRIORITIES)
+        total = f"📊 Total Tasks: {len(self.tasks)}"
+        if shown is not self.tasks:
+            total += f" (showing {len(shown)})"
+        self.stats_label.config(text=f"{total}   |   {counts}")
     
     def complete_task(self, task_id):
         if task_id in self.tasks:
-            task = self.tasks[task_id]
+            task = self.tasks.get(task_id)
             result = messagebox.askyesno("Complete Task", 
                                         f"Mark '{task.title}' as completed?\n\nThis will remove the task.")
             if result:
-                del self.tasks[task_id]
+                self.search_index.remove(self.tasks.remove(task_id))
                 self.refresh_tasks()
-                self.save_tasks()
+                self.remove_saved_task(task_id)
                 messagebox.showinfo("Success", "Task completed! 🎉")
     
     def delete_task(self, task_id):
         if task_id in self.tasks:
-            task = self.tasks[task_id]
+            task = self.tasks.get(task_id)
             result = messagebox.askyesno("Delete Task", 
                                         f"Are you sure you want to delete '{task.title}'?")
             if result:
-                del self.tasks[task_id]
+                self.search_index.remove(self.tasks.remove(task_id))
                 self.refresh_tasks()
-                self.save_tasks()
+                self.remove_saved_task(task_id)
+    
+    def save_task(self, task):
+        # Only the changed task is written, not the whole list
+        try:
+            self.writer.add(task)
+        except Exception as e:
+            print(f"Save error: {e}")
     
-    def save_tasks(self):
+    def remove_saved_task(self, task_id):
         try:
-            data = {tid: task.to_dict() for tid, task in self.tasks.items()}
-            with open(self.data_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            self.writer.delete(task_id)
         except Exception as e:
             print(f"Save error: {e}")
     
     def load_tasks(self):
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r') as f:
-                    data = json.load(f)
-                    self.tasks = {tid: Task.from_dict(td) for tid, td in data.items()}
+            self.tasks = TaskCollection(self.store.load())
         except Exception as e:
             print(f"Load error: {e}")
-            self.tasks = {}
+            self.tasks = TaskCollection()
+        self.search_index = TaskSearchIndex(self.tasks)
     
     def run(self):
         def on_close():
-            self.save_tasks()
+            # Writes out any pending changes before the window goes away;
+            # if that fails, the window stays open unless the user accepts
+            # losing them
+            try:
+                self.writer.close()
+            except Exception as e:
+                if not messagebox.askyesno("Save failed", f"{e}\n\nClose anyway and lose these changes?",
+                                           icon='warning'):
+                    return
             self.root.destroy()
         
         self.root.protocol("WM_DELETE_WINDOW", on_close)
+        self.root.after_idle(lambda: report_ready("todo_list.py"))
+        if benchmark_mode():
+            self.root.after(100, self.root.destroy)
+        elif self.store.notice:
+            # e.g. --store json after the tasks were migrated to tasks.db
+            self.root.after(200, lambda: messagebox.showwarning("Task storage", self.store.notice))
         self.root.mainloop()
 
 if __name__ == "__main__":
-    app = TodoList()
+    parser = argparse.ArgumentParser(description="To-Do List")
+    parser.add_argument('--store', choices=['sqlite', 'journal', 'json'], default=DEFAULT_STORE,
+                        help="task storage backend (default: $NEUROTASK_TASK_STORE or sqlite)")
+    args = parser.parse_args()
+    app = TodoList(store=args.store)
     app.run()
\ No newline at end of file
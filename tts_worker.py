@@ -0,0 +1,188 @@
+import collections
+import os
+import queue
+import tempfile
+import threading
+import time
+import wave
+
+try:
+    import pyaudio
+except ImportError:
+    pyaudio = None
+
+PLAYBACK_FRAMES = 1024
+# Room echo and output buffering outlast the last played block
+ECHO_TAIL = 0.4
+
+
+class RenderedAudio:
+    def __init__(self, pcm, sample_rate, sample_width, channels):
+        self.pcm = pcm
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.channels = channels
+
+
+class ResponseAudioCache:
+    # LRU of replies already synthesized to PCM, keyed by their text
+    def __init__(self, max_items=32):
+        self.max_items = max_items
+        self.items = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text):
+        with self.lock:
+            audio = self.items.get(text)
+            if audio is None:
+                self.misses += 1
+                return None
+            self.items.move_to_end(text)
+            self.hits += 1
+            return audio
+
+    def put(self, text, audio):
+        with self.lock:
+            self.items[text] = audio
+            self.items.move_to_end(text)
+            while len(self.items) > self.max_items:
+                self.items.popitem(last=False)
+
+    def __contains__(self, text):
+        with self.lock:
+            return text in self.items
+
+    def __len__(self):
+        with self.lock:
+            return len(self.items)
+
+
+class TTSWorker:
+    # Owns the pyttsx3 engine on its own thread (engines must stay on the
+    # thread that created them) and speaks queued replies without blocking
+    # the caller. interrupt() is barge-in: queued replies are dropped and the
+    # current one stops at the next word, or the next audio block when it is
+    # played from the cache. Replies marked cacheable are rendered to PCM
+    # once and replayed from an LRU, which needs pyaudio for playback.
+    def __init__(self, rate=150, cache_size=32):
+        self.rate = rate
+        self.cache = ResponseAudioCache(cache_size) if pyaudio is not None else None
+        self.requests = queue.Queue()
+        self.cancel = threading.Event()
+        self.generation = 0
+        self.lock = threading.Lock()
+        self.speaking = False
+        self.queued = 0
+        self.stopped_at = 0.0
+        self.ready = threading.Event()
+        self.error = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def say(self, text, cacheable=False):
+        with self.lock:
+            self.queued += 1
+            self.requests.put((self.generation, text, cacheable))
+
+    def playing(self, tail=ECHO_TAIL):
+        # True from say() until `tail` seconds after the audio stops, i.e.
+        # while the microphone may be hearing our own reply
+        return (self.queued > 0 or self.speaking
+                or time.monotonic() - self.stopped_at < tail)
+
+    def prerender(self, texts):
+        # Fill the cache for replies known in advance, e.g. at startup
+        if self.cache is None:
+            return
+        for text in texts:
+            self.requests.put((None, text, True))
+
+    def interrupt(self):
+        with self.lock:
+            self.generation += 1
+            self.cancel.set()
+
+    def run(self):
+        try:
+            import pyttsx3
+            self.engine = pyttsx3.init()
+            self.engine.setProperty('rate', self.rate)
+            self.engine.connect('started-word', self._on_word)
+        except Exception as e:
+            self.error = e
+            self.ready.set()
+            return
+        self.audio = pyaudio.PyAudio() if self.cache is not None else None
+        self.stream = None
+        self.stream_format = None
+        self.ready.set()
+
+        while True:
+            generation, text, cacheable = self.requests.get()
+            if generation is None:
+                if self.cache is not None and text not in self.cache:
+                    self._render(text)
+                continue
+            with self.lock:
+                self.queued -= 1
+                if generation != self.generation:
+                    continue
+                self.cancel.clear()
+                self.speaking = True
+            try:
+                rendered = None
+                if cacheable and self.cache is not None:
+                    rendered = self.cache.get(text) or self._render(text)
+                if rendered is not None:
+                    self._play(rendered)
+                else:
+                    self.engine.say(text)
+                    self.engine.runAndWait()
+            except Exception as e:
+                print(f"❌ TTS error: {e}")
+            finally:
+                self.stopped_at = time.monotonic()
+                self.speaking = False
+
+    def _on_word(self, name, location, length):
+        if self.cancel.is_set():
+            self.engine.stop()
+
+    def _render(self, text):
+        # Not every pyttsx3 driver writes WAV (nsss writes AIFF); with those
+        # the cache is turned off and every reply is spoken live
+        fd, path = tempfile.mkstemp(suffix='.wav')
+        os.close(fd)
+        try:
+            self.engine.save_to_file(text, path)
+            self.engine.runAndWait()
+            with wave.open(path, 'rb') as wav:
+                rendered = RenderedAudio(wav.readframes(wav.getnframes()), wav.getframerate(),
+                                         wav.getsampwidth(), wav.getnchannels())
+        except Exception as e:
+            print(f"⚠️ Can't pre-render speech, caching disabled: {e}")
+            self.cache = None
+            return None
+        finally:
+            os.remove(path)
+        self.cache.put(text, rendered)
+        return rendered
+
+    def _play(self, rendered):
+        # The output stream stays open between replies with the same format
+        audio_format = (rendered.sample_rate, rendered.sample_width, rendered.channels)
+        if self.stream_format != audio_format:
+            if self.stream is not None:
+                self.stream.close()
+            self.stream = self.audio.open(format=self.audio.get_format_from_width(rendered.sample_width),
+                                          channels=rendered.channels, rate=rendered.sample_rate,
+                                          output=True)
+            self.stream_format = audio_format
+        block = PLAYBACK_FRAMES * rendered.sample_width * rendered.channels
+        for offset in range(0, len(rendered.pcm), block):
+            if self.cancel.is_set():
+                return
+            self.stream.write(rendered.pcm[offset:offset + block])
+
@@ -0,0 +1,46 @@
+import queue
+
+
+class UIChannel:
+    # Tk widgets may only be touched from the Tk thread. Worker threads post
+    # (kind, value) updates here and a root.after poller applies everything
+    # that piled up since the last tick in one go: handlers registered with
+    # coalesce=True only see the newest value (e.g. a status line), the
+    # others get the whole batch so they can update their widget once.
+    def __init__(self, root, interval=50):
+        self.root = root
+        self.interval = interval
+        self.updates = queue.Queue()
+        self.handlers = {}
+        self.running = False
+
+    def handle(self, kind, func, coalesce=False):
+        self.handlers[kind] = (func, coalesce)
+
+    def post(self, kind, value=None):
+        self.updates.put((kind, value))
+
+    def start(self):
+        self.running = True
+        self.root.after(self.interval, self.poll)
+
+    def stop(self):
+        self.running = False
+
+    def poll(self):
+        if not self.running:
+            return
+        batches = {}
+        while True:
+            try:
+                kind, value = self.updates.get_nowait()
+            except queue.Empty:
+                break
+            batches.setdefault(kind, []).append(value)
+        for kind, values in batches.items():
+            func, coalesce = self.handlers[kind]
+            try:
+                func(values[-1] if coalesce else values)
+            except Exception as e:
+                print(f"❌ UI update error: {e}")
+        self.root.after(self.interval, self.poll)
@@ -1,29 +1,160 @@
+import argparse
 import tkinter as tk
 from tkinter import scrolledtext
 import threading
+import time
 import datetime
+from intent_router import IntentRouter
+from ui_channel import UIChannel
+from model_server import (benchmark_mode, connect_model_server, report_first_inference, report_ready,
+                          server_has)
 
-try:
-    import speech_recognition as sr
-    import pyttsx3
-    VOICE_AVAILABLE = True
-except:
-    VOICE_AVAILABLE = False
+# Imported lazily by load_voice_modules() so the window shows up first
+sr = None
+pyttsx3 = None
+VOICE_AVAILABLE = False
+
+# How long to wait for a model server that is still loading its TTS engine
+# before starting a local one
+SERVER_TTS_WAIT = 3.0
+
+# Older chat lines are trimmed so long sessions don't keep growing the widget
+MAX_CHAT_LINES = 1000
+
+GREETING_REPLY = "Hello! How can I help you today?"
+WEATHER_REPLY = "I don't have access to weather data right now, but I hope it's nice where you are!"
+NAME_REPLY = "I'm your AI Voice Assistant, here to help you!"
+HOW_ARE_YOU_REPLY = "I'm doing great, thank you for asking! How can I help you?"
+THANKS_REPLY = "You're very welcome! Happy to help!"
+GOODBYE_REPLY = "Goodbye! Have a wonderful day!"
+HELP_REPLY = "I can tell you the time, date, day, or just chat with you. Try asking me something!"
+# Replies that never change are pre-rendered once and replayed from the TTS cache
+STATIC_REPLIES = (GREETING_REPLY, WEATHER_REPLY, NAME_REPLY, HOW_ARE_YOU_REPLY,
+                  THANKS_REPLY, GOODBYE_REPLY, HELP_REPLY)
+
+def build_router():
+    # Earlier entries in the old if/elif chain keep the higher priority
+    now = datetime.datetime.now
+    router = IntentRouter(fallback=lambda text: f"You said: {text}. I'm learning more commands every day!")
+    router.register('greeting', ['hello', 'hi', 'hey', 'greetings'], lambda text: GREETING_REPLY, priority=100)
+    router.register('time', ['time'], lambda text: f"The current time is {now().strftime('%I:%M %p')}", priority=90)
+    router.register('date', ['date', 'today'], lambda text: f"Today is {now().strftime('%B %d, %Y')}", priority=80)
+    router.register('day', ['day'], lambda text: f"Today is {now().strftime('%A')}", priority=70)
+    router.register('weather', ['weather'], lambda text: WEATHER_REPLY, priority=60)
+    router.register('name', ['your name', 'who are you'], lambda text: NAME_REPLY, priority=50)
+    router.register('how_are_you', ['how are you'], lambda text: HOW_ARE_YOU_REPLY, priority=40)
+    router.register('thanks', ['thank', 'thanks', 'appreciate'], lambda text: THANKS_REPLY, priority=30)
+    router.register('goodbye', ['bye', 'goodbye', 'see you', 'exit'], lambda text: GOODBYE_REPLY, priority=20)
+    router.register('help', ['help'], lambda text: HELP_REPLY, priority=10)
+    router.compile()
+    return router
+
+def load_voice_modules():
+    global sr, pyttsx3, VOICE_AVAILABLE
+    try:
+        import speech_recognition as sr
+        import pyttsx3
+        VOICE_AVAILABLE = True
+    except:
+        VOICE_AVAILABLE = False
+    return VOICE_AVAILABLE
 
 class VoiceAssistant:
-    def __init__(self):
+    def __init__(self, speech_backend=None, vosk_model=None, wav_path=None):
         self.root = tk.Tk()
         self.root.title("🎤 Voice Assistant")
         self.root.geometry("800x700")
         self.root.configure(bg='#0f172a')
         self.voice_listening = False
         
-        if VOICE_AVAILABLE:
-            self.recognizer = sr.Recognizer()
-            self.tts_engine = pyttsx3.init()
-            self.tts_engine.setProperty('rate', 150)
+        self.tts = None
+        self.client = None
+        self.speech = None
+        self.speech_backend = speech_backend
+        self.vosk_model = vosk_model
+        self.backend_error = None
+        self.wav_path = wav_path
+        self.audio = None
+        self.server_speaking = False
+        self.speaking_checked = 0.0
+        self.router = build_router()
+        self.models_loaded = threading.Event()
         
         self.setup_gui()
+        # Listener threads never touch widgets; they post here instead
+        self.ui = UIChannel(self.root)
+        self.ui.handle('status', self.show_status, coalesce=True)
+        self.ui.handle('message', self.show_messages)
+        self.ui.start()
+        threading.Thread(target=self.load_models, daemon=True).start()
+        self.root.after(50, self.check_models)
+    
+    def load_models(self):
+        global VOICE_AVAILABLE
+        try:
+            self.client = self.attach_server()
+            if load_voice_modules():
+                try:
+                    self.load_recognizer()
+                    if self.client:
+                        self.client.call('prerender', list(STATIC_REPLIES))
+                    else:
+                        from tts_worker import TTSWorker
+                        self.tts = TTSWorker(rate=150)
+                        self.tts.ready.wait()
+                        if self.tts.error:
+                            raise self.tts.error
+                        self.tts.prerender(STATIC_REPLIES)
+                    report_first_inference("voice_assistant.py")
+                except Exception as e:
+                    print(f"❌ Voice engine failed: {e}")
+                    VOICE_AVAILABLE = False
+        finally:
+            self.models_loaded.set()
+    
+    def attach_server(self):
+        # The model server's TTS engine, if it has one; only TTS is needed
+        # here, so don't wait for the server's TensorFlow models
+        client = connect_model_server()
+        if client is None:
+            return None
+        try:
+            if server_has(client, 'tts', SERVER_TTS_WAIT):
+                return client
+        except Exception as e:
+            print(f"⚠️ Model server not usable: {e}")
+        client.close()
+        return None
+    
+    def load_recognizer(self):
+        # Backend comes from --speech-backend or NEUROTASK_SPEECH_BACKEND; an
+        # offline engine that fails to load falls back to Google
+        from speech_backends import DEFAULT_BACKEND, DEFAULT_VOSK_MODEL, SpeechRecognizer
+        backend = self.speech_backend or DEFAULT_BACKEND
+        options = {'model_path': self.vosk_model or DEFAULT_VOSK_MODEL} if backend == 'vosk' else {}
+        try:
+            self.speech = SpeechRecognizer(backend, **options)
+        except Exception as e:
+            self.backend_error = f"{backend} recognizer not available: {e}"
+            print(f"❌ {self.backend_error}")
+            self.speech = SpeechRecognizer('google')
+        self.recognizer = self.speech.recognizer
+    
+    def check_models(self):
+        if not self.models_loaded.is_set():
+            self.root.after(50, self.check_models)
+            return
+        self.set_status('Ready')
+        if not VOICE_AVAILABLE:
+            self.add_message("⚠️ Voice features not available!")
+            self.add_message("Install: pip install SpeechRecognition pyttsx3 pyaudio")
+        else:
+            if self.backend_error:
+                self.add_message(f"⚠️ {self.backend_error}, using google")
+            self.listen_btn.config(state='normal')
+            self.add_message(f"Ready! Click 'Start Listening' to begin. (recognizer: {self.speech.name})")
+        if benchmark_mode():
+            self.root.destroy()
     
     def setup_gui(self):
         header = tk.Frame(self.root, bg='#1e40af', height=80)
@@ -70,94 +201,145 @@ class VoiceAssistant:
         tk.Label(footer, text="💡 Say 'hello', 'time', 'date', 'thanks', 'bye' or anything!",
                 font=('Helvetica', 9), bg='#0f172a', fg='#94a3b8').pack()
         
-        if not VOICE_AVAILABLE:
-            self.add_message("⚠️ Voice features not available!")
-            self.add_message("Install: pip install SpeechRecognition pyttsx3 pyaudio")
-            self.listen_btn.config(state='disabled')
-        else:
-            self.add_message("Ready! Click 'Start Listening' to begin.")
+        self.status_text.config(text='Loading voice engine... ⏳')
+        self.listen_btn.config(state='disabled')
     
     def toggle_listening(self):
         if not self.voice_listening:
+            if not self.start_audio():
+                return
             self.voice_listening = True
+            self.audio.listening = True
             self.listen_btn.config(text="🛑 Stop Listening", bg='#ef4444')
-            self.status_indicator.config(fg='#3b82f6')
-            self.status_text.config(text='Listening...')
-            threading.Thread(target=self.listen_loop, daemon=True).start()
+            self.set_status('Listening...', '#3b82f6')
         else:
             self.voice_listening = False
+            self.audio.listening = False
             self.listen_btn.config(text="🎤 Start Listening", bg='#3b82f6')
-            self.status_indicator.config(fg='#10b981')
-            self.status_text.config(text='Ready')
-    
-    def listen_loop(self):
-        while self.voice_listening:
-            try:
-                with sr.Microphone() as source:
-                    self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
-                    audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=10)
-                    
-                    self.status_text.config(text='Processing...')
-                    self.status_indicator.config(fg='#f59e0b')
-                    
-                    text = self.recognizer.recognize_google(audio)
-                    
-                    self.add_message(f"You: {text}")
-                    response = self.process_command(text)
-                    self.add_message(f"Assistant: {response}")
-                    
-                    self.tts_engine.say(response)
-                    self.tts_engine.runAndWait()
-                    
-                    self.status_text.config(text='Listening...')
-                    self.status_indicator.config(fg='#3b82f6')
-                    
-            except sr.WaitTimeoutError:
-                continue
-            except sr.UnknownValueError:
-                self.add_message("❌ Could not understand audio")
-                self.status_text.config(text='Listening...')
-            except sr.RequestError as e:
-                self.add_message(f"❌ Request error: {e}")
-                self.status_text.config(text='Listening...')
-            except Exception as e:
-                self.add_message(f"❌ Error: {str(e)}")
-                break
+            self.set_status('Ready', '#10b981')
+    
+    def start_audio(self):
+        # The microphone (or --wav file) is opened once and stays open; Stop
+        # Listening only pauses the pipeline so the noise floor keeps adapting
+        if self.audio:
+            return True
+        from audio_pipeline import AudioPipeline, MicrophoneSource, WavSource
+        try:
+            source = WavSource(self.wav_path, realtime=True) if self.wav_path else MicrophoneSource()
+        except Exception as e:
+            self.add_message(f"❌ Microphone error: {str(e)}")
+            return False
+        self.audio = AudioPipeline(source, self.recognize_utterance, self.handle_utterance,
+                                   on_speech=self.on_speech, playback=self.assistant_speaking)
+        self.audio.start()
+        return True
+    
+    def assistant_speaking(self):
+        # Asked for every audio chunk on the VAD thread; the server is polled
+        # at most every 100 ms
+        if self.client:
+            now = time.monotonic()
+            if now - self.speaking_checked > 0.1:
+                try:
+                    self.server_speaking = self.client.call('speaking')
+                except Exception:
+                    self.server_speaking = False
+                self.speaking_checked = now
+            return self.server_speaking
+        return self.tts is not None and self.tts.playing()
+    
+    def on_speech(self):
+        # Barge-in: only speech louder than the reply's echo gets this far
+        # while it plays, and cuts it off
+        self.interrupt_speech()
+        self.set_status('Hearing you...', '#f59e0b')
+    
+    def recognize_utterance(self, utterance):
+        return self.speech.recognize(utterance.to_audio_data())
+    
+    def handle_utterance(self, utterance, text, error):
+        # Runs on the recognition stage; capture continues meanwhile
+        if error is None:
+            latency = self.speech.last_latency
+            print(f"⏱️ {self.speech.name} recognized in {latency * 1000:.0f} ms "
+                  f"(avg {self.speech.average_latency * 1000:.0f} ms)")
+            
+            self.add_message(f"You: {text}   ⏱️ {latency * 1000:.0f} ms")
+            response = self.process_command(text)
+            self.add_message(f"Assistant: {response}")
+            self.speak(response)
+        elif isinstance(error, sr.UnknownValueError):
+            self.add_message("❌ Could not understand audio")
+        elif isinstance(error, sr.RequestError):
+            self.add_message(f"❌ Request error: {error}")
+        else:
+            self.add_message(f"❌ Error: {str(error)}")
+        if self.voice_listening:
+            self.set_status('Listening...', '#3b82f6')
     
     def process_command(self, text):
-        t = text.lower()
-        
-        if any(w in t for w in ['hello', 'hi', 'hey', 'greetings']):
-            return "Hello! How can I help you today?"
-        elif 'time' in t:
-            return f"The current time is {datetime.datetime.now().strftime('%I:%M %p')}"
-        elif 'date' in t or 'today' in t:
-            return f"Today is {datetime.datetime.now().strftime('%B %d, %Y')}"
-        elif 'day' in t:
-            return f"Today is {datetime.datetime.now().strftime('%A')}"
-        elif 'weather' in t:
-            return "I don't have access to weather data right now, but I hope it's nice where you are!"
-        elif 'your name' in t or 'who are you' in t:
-            return "I'm your AI Voice Assistant, here to help you!"
-        elif 'how are you' in t:
-            return "I'm doing great, thank you for asking! How can I help you?"
-        elif any(w in t for w in ['thank', 'thanks', 'appreciate']):
-            return "You're very welcome! Happy to help!"
-        elif any(w in t for w in ['bye', 'goodbye', 'see you', 'exit']):
-            return "Goodbye! Have a wonderful day!"
-        elif 'help' in t:
-            return "I can tell you the time, date, day, or just chat with you. Try asking me something!"
+        return self.router.route(text)
+    
+    def speak(self, text):
+        # Both the model server's engine and the local TTSWorker queue the
+        # reply and return at once
+        cacheable = text in STATIC_REPLIES
+        if self.client:
+            self.client.call('speak', text, cacheable)
+            # Count as speaking right away, not at the next poll
+            self.server_speaking = True
+            self.speaking_checked = time.monotonic()
         else:
-            return f"You said: {text}. I'm learning more commands every day!"
+            self.tts.say(text, cacheable=cacheable)
+    
+    def interrupt_speech(self):
+        try:
+            if self.client:
+                self.client.call('interrupt')
+            elif self.tts:
+                self.tts.interrupt()
+        except Exception as e:
+            print(f"❌ TTS error: {e}")
+    
+    def set_status(self, text, color=None):
+        self.ui.post('status', (text, color))
+    
+    def show_status(self, status):
+        text, color = status
+        self.status_text.config(text=text)
+        if color:
+            self.status_indicator.config(fg=color)
     
     def add_message(self, message):
+        # Safe from any thread; timestamped now, shown on the next UI tick
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        self.chat_display.insert(tk.END, f"[{timestamp}] {message}\n\n")
+        self.ui.post('message', f"[{timestamp}] {message}\n\n")
+    
+    def show_messages(self, messages):
+        self.chat_display.insert(tk.END, "".join(messages))
+        lines = int(self.chat_display.index('end-1c').split('.')[0])
+        if lines > MAX_CHAT_LINES:
+            self.chat_display.delete('1.0', f"{lines - MAX_CHAT_LINES + 1}.0")
         self.chat_display.see(tk.END)
     
     def run(self):
+        def on_close():
+            self.ui.stop()
+            if self.audio:
+                self.audio.stop()
+            self.root.destroy()
+        
+        self.root.protocol("WM_DELETE_WINDOW", on_close)
+        self.root.after_idle(lambda: report_ready("voice_assistant.py"))
         self.root.mainloop()
 
 if __name__ == "__main__":
-    app = VoiceAssistant()
+    parser = argparse.ArgumentParser(description="Voice Assistant")
+    parser.add_argument('--speech-backend', choices=['google', 'sphinx', 'vosk'],
+                        help="speech recognizer (default: $NEUROTASK_SPEECH_BACKEND or google)")
+    parser.add_argument('--vosk-model', help="path to an unpacked Vosk model directory")
+    parser.add_argument('--wav', help="feed a 16-bit WAV file instead of the microphone")
+    args = parser.parse_args()
+    app = VoiceAssistant(speech_backend=args.speech_backend, vosk_model=args.vosk_model,
+                         wav_path=args.wav)
     app.run()
\ No newline at end of file